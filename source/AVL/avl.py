@@ -81,9 +81,8 @@ class AVLScene(BSTScene):
         self.avl.right_rotate(node)
         self.play(node.animate(run_time=0.0001).shift(RIGHT * 0))  # dont move this magic line
         self.next_section(f"update layout")
-        self.play(self.avl.animate(run_time=1 * run_time_factor).update_tree_layout(relative_to_root=True,
-                                                                                    relative_x=relative_pos[0],
-                                                                                    relative_y=relative_pos[1]))
+        self.play(self.avl.animate_tree_layout(relative_to_root=True, relative_x=relative_pos[0],
+                                               relative_y=relative_pos[1], run_time=1 * run_time_factor))
 
     def left_rotate(self, node: AVLNode, run_time_factor=1, fast_rotate: bool = False):
         relative_pos = [0] * 3
@@ -114,9 +113,8 @@ class AVLScene(BSTScene):
         self.avl.left_rotate(node)
         self.play(node.animate(run_time=0.0001).shift(RIGHT * 0))  # dont move this magic line
         self.next_section(f"update layout")
-        self.play(self.avl.animate(run_time=1 * run_time_factor).update_tree_layout(relative_to_root=True,
-                                                                                    relative_x=relative_pos[0],
-                                                                                    relative_y=relative_pos[1]))
+        self.play(self.avl.animate_tree_layout(relative_to_root=True, relative_x=relative_pos[0],
+                                               relative_y=relative_pos[1], run_time=1 * run_time_factor))
 
     def balance_up(self, node: AVLNode, run_time_factor=1, fast_anim: bool = False, **kwargs):
         while node is not None:
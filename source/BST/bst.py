@@ -106,7 +106,7 @@ class BSTScene(SectionsScene):
 
         if insert_last_node:
             self.next_section("Key inserted", skip_section=fast_insert)
-            self.play(self.bst.animate(run_time=1 * run_time_factor).update_tree_layout())
+            self.play(self.bst.animate_tree_layout(run_time=1 * run_time_factor))
             new_edge = self.bst.create_edge(new_key.parent, new_key)
             self.play(new_edge.draw_edge(run_time=1.5 * run_time_factor))
 
@@ -147,7 +147,7 @@ class BSTScene(SectionsScene):
                                                                               stroke_color=VERTEX_STROKE_COLOR))
         self.bst.add_updater(self.bst.update_edges)
         self.next_section("Update tree layout", skip_section=fast_delete)
-        self.play(self.bst.animate.update_tree_layout(), run_time=1 * run_time_factor)
+        self.play(self.bst.animate_tree_layout(), run_time=1 * run_time_factor)
 
     def animate_successor(self, key: int, run_time_factor: float = 1, fast_successor: bool = False):
         run_time_factor = 0.2 if fast_successor else 1
@@ -4,7 +4,7 @@ from tools.movie_maker import render_scenes
 from tools.scenes import *
 from tools.graphs.edge import *
 from tools.graphs.node import IndicateNode
-from tools.graphs.utils import get_vertices_cut
+from tools.graphs.utils import get_vertices_cut, IncrementalCuts
 from MST.mst_utils import *
 
 ROOT_PATH = Path(__file__).resolve().parent
@@ -284,6 +284,7 @@ class KruskalUnion(SectionsScene):
     def __init__(self, graph, **kwargs):
         self.graph = graph.scale(0.94).to_edge(RIGHT, buff=0.7)
         self.graph.remove_updater(self.graph.update_edges)
+        self.cuts = IncrementalCuts(self.graph, **DEFAULT_CUT_PARAMS)
         self.code = create_code(KRUSKAL_UNION_PSEUDO_CODE, line_no_buff=0.6).scale_to_fit_width(
             config.frame_width * 0.47).to_corner(LEFT + UP)
         self.edges_lst = get_edges_lst(self.graph).match_width(self.code).to_corner(LEFT + DOWN)
@@ -350,7 +351,7 @@ class KruskalUnion(SectionsScene):
                 self.highlight_and_indicate_code([10])
                 self.next_section("Union visu", skip_section=find_mst)
                 new_cut_vertices = cuts_to_vertices[cut_u] | cuts_to_vertices[cut_v]
-                cut = self.get_cut(list(new_cut_vertices))
+                cut = self.cuts.union(cuts_to_vertices[cut_u], cuts_to_vertices[cut_v]).set_z_index(-1)
                 cuts_to_vertices[cut] = new_cut_vertices
                 for vertex in new_cut_vertices:
                     vertices_to_cuts[vertex] = cut
@@ -383,8 +384,8 @@ class KruskalUnion(SectionsScene):
     def find_circle_in_union(self, u, v, **kwargs):
         pass
 
-    def get_cut(self, vertices: list[Hashable], **kwargs) -> Polygon:
-        return get_vertices_cut(self.graph, vertices, **{**kwargs, **DEFAULT_CUT_PARAMS}).set_z_index(-1)
+    def get_cut(self, vertices: list[Hashable]) -> Polygon:
+        return self.cuts.get_cut(vertices).set_z_index(-1)
 
 
 class KruskalUnionExample(KruskalUnion):
@@ -4,7 +4,7 @@ from tools.movie_maker import render_scenes
 from tools.scenes import *
 from tools.graphs.edge import *
 from tools.graphs.node import IndicateNode
-from tools.graphs.utils import get_vertices_cut, get_neighbors
+from tools.graphs.utils import IncrementalCuts, get_neighbors
 from MST.mst_utils import *
 
 ROOT_PATH = Path(__file__).resolve().parent
@@ -56,6 +56,7 @@ class Prim(SectionsScene):
     def __init__(self, graph: WeightedGraph, root: Hashable = None, **kwargs):
         self.graph = graph.scale(0.94).to_edge(RIGHT, buff=0.7)
         self.graph.remove_updater(self.graph.update_edges)
+        self.cuts = IncrementalCuts(self.graph, **DEFAULT_CUT_PARAMS)
         self.root = root
         self.cut = VGroup().move_to(self.graph.vertices[self.root])
         self.code = create_code(PRIM_PSEUDO_CODE, line_no_buff=0.6).scale_to_fit_width(
@@ -201,8 +202,9 @@ class Prim(SectionsScene):
     def find_circle_in_union(self, u, v, **kwargs):
         pass
 
-    def get_cut(self, vertices: list[Hashable], **kwargs) -> Polygon:
-        return get_vertices_cut(self.graph, vertices, **{**kwargs, **DEFAULT_CUT_PARAMS}).set_z_index(-5)
+    def get_cut(self, vertices: list[Hashable]) -> Polygon:
+        """Every extracted vertex extends the previous cut, so each cut is merged from the previous one"""
+        return self.cuts.get_cut(vertices).set_z_index(-5)
 
 
 class PrimExample(Prim):
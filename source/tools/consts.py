@@ -7,6 +7,7 @@ DASTIMATOR_PATH: Path = Path(__file__).resolve().parent.parent.parent
 MEDIA_PATH: Path = DASTIMATOR_PATH / "media"
 SITE_PATH = DASTIMATOR_PATH / "docs"
 MOVIES_PATH = SITE_PATH / "movies"
+LAYOUT_CACHE_PATH: Path = MEDIA_PATH / "layout_cache"  # None disables the graph layouts cache
 
 # ---------------------------------- Graph Consts ---------------------------------- #
 VERTEX_COLOR: str = DARK_BLUE
@@ -7,10 +7,11 @@ from manim import *
 from manim import Polygon, Rectangle, SurroundingRectangle, VGroup
 from manim.mobject.geometry.boolean_ops import _BooleanOps
 from manim_fonts import *
-from scipy.spatial import ConvexHull, KDTree
+from scipy.spatial import ConvexHull
 import networkx as nx
 
 from .consts import LINES_OFF_OPACITY
+from .polygons import get_mobject_points, points_to_polygon
 from .code_styles import DarculaStyle, pygments_monkeypatch_style
 
 CODE_MATH_SCALE = 0.9
@@ -180,34 +181,8 @@ def color_tex(equation: Tex | MathTex, t2c: dict, tex_class: type[Tex | MathTex]
 # ---------------------------- geometry ----------------------------
 
 def boolean_op_to_polygons(boolean_op: _BooleanOps, convex_hull=True, **kwargs) -> Polygon:
-    points = np.array([np.copy(bezier(point)(1)) for point in boolean_op.get_cubic_bezier_tuples()])
-    # points = np.copy(boolean_op.points)
-    # return Polygon(*points, **kwargs)
-    points = [points[i] for i in ConvexHull(points[:, :2]).vertices] if convex_hull else [i for i in points]
-    # return Polygon(*np.array(points), **kwargs)
-    filter_points = [points[0]]
-    for i in range(1, len(points)):
-        if not np.any(np.all(np.isclose(filter_points, points[i], atol=1.e-1), axis=1)):
-            filter_points = np.vstack((filter_points, points[i]))
-    return Polygon(*np.array(filter_points), **kwargs)
-    tmp_points = np.copy(filter_points)
-    G = nx.Graph()  # A graph to hold the nearest neighbours
-    points = list(map(tuple, filter_points[:, :2]))
-    tree = KDTree(points, leafsize=2)  # Create a distance tree
-    found_points = set()
-    start_point = next_point = points[0]
-    G.add_nodes_from(points)
-    while len(found_points) < len(points):
-        for dist, ind in zip(*tree.query(next_point, k=len(points))):
-            point = tuple(points[ind])
-            if point not in found_points:
-                G.add_edge(next_point, point)
-                found_points.add(point)
-                next_point = point
-                break
-    target_point = next_point
-    filter_points = [np.append(p, 0) for p in nx.shortest_path(G, source=start_point, target=target_point)]
-    return Polygon(*np.array(filter_points), **kwargs)
+    """The curve ends of a manim boolean op as a polygon. Prefer tools.polygons, which skips the bezier round trip."""
+    return points_to_polygon(get_mobject_points(boolean_op), convex_hull, **kwargs)
 
 
 def get_convex_hull_polygon(points: np.ndarray, round_radius=0.2, **kwargs) -> Polygon:
@@ -63,6 +63,7 @@ class AVLTree(BST):
 
     def left_rotate(self, node: AVLNode):
         pivot = node.right
+        self.mark_layout_change(node, pivot)
         pivot.parent = node.parent
         if pivot.parent is not None:
             if pivot.parent.right == node:
@@ -71,6 +72,8 @@ class AVLTree(BST):
                 pivot.parent.left = pivot
         node.parent = pivot
         node.right = pivot.left
+        if node.right is not None:
+            node.right.parent = node
         pivot.left = node
         self.update_height(node)
         self.update_height(pivot)
@@ -86,6 +89,7 @@ class AVLTree(BST):
 
     def right_rotate(self, node: AVLNode):
         pivot = node.left
+        self.mark_layout_change(node, pivot)
         pivot.parent = node.parent
         if pivot.parent is not None:
             if pivot.parent.right == node:
@@ -94,6 +98,8 @@ class AVLTree(BST):
                 pivot.parent.left = pivot
         node.parent = pivot
         node.left = pivot.right
+        if node.left is not None:
+            node.left.parent = node
         pivot.right = node
         self.update_height(node)
         self.update_height(pivot)
@@ -129,11 +135,17 @@ class AVLTree(BST):
     def _insert_key(self, key: int | Node, node: Node = None, parent: Node = None, balance_up=False,
                     update_height=True) -> Node:
         key_node = key if isinstance(key, self.node_type) else self.node_type(key)
-        insert_node = super()._insert_key(key_node, node, parent, balance_up=balance_up, update_height=update_height)
+        insert_node = super()._insert_key(key_node, node, parent)
         if balance_up:
             self.balance_up(key_node)
         if update_height:
-            self.update_height(insert_node)
+            # heights along the insertion path, up to the node the key was inserted under
+            current_node = key_node
+            while current_node is not None:
+                self.update_height(current_node)
+                if current_node is insert_node:
+                    break
+                current_node = current_node.parent
         return insert_node
 
     def insert_keys(self, keys: list | int, **kwargs):
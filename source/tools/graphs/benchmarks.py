@@ -0,0 +1,188 @@
+"""Timings of the graph helpers on random graphs and trees. Run with: python -m tools.graphs.benchmarks"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Hashable
+
+import networkx as nx
+import numpy as np
+
+from tools.graphs.bst import get_tree_columns
+from tools.graphs.force_layout import MIN_DISTANCE, _get_repulsion, force_layout
+from tools.graphs.my_graphs import Graph
+from tools.graphs.utils import IncrementalCuts, find_all_triangular_in_vertives_set, get_tangent_points, \
+    get_vertices_cut, get_vertices_voronoi_cells
+
+CUT_BENCHMARK_SIZES = (50, 100, 200)
+BST_BENCHMARK_SIZES = (1000, 10000, 100000)
+FORCE_BENCHMARK_SIZES = (200, 1000, 3000)
+# relative error of the grid repulsion of all vertices, about 1% on uniform random positions. Missing the adjacent
+# cells (exact pairs or the far cells) costs 25% and more.
+FORCE_REPULSION_RTOL = 0.05
+FORCE_EDGES_PER_VERTEX = 2
+CUT_FRACTION = 0.2  # of the vertices in the benchmarked cut
+NEAREST_NEIGHBORS = 3
+GRAPH_SIZE = np.array([12, 7])
+
+
+def get_random_graph(n: int, seed: int = 0) -> Graph:
+    """n vertices spread over the frame, each connected to its nearest neighbors"""
+    rng = np.random.default_rng(seed)
+    points = (rng.random((n, 2)) - 0.5) * GRAPH_SIZE
+    distances = np.linalg.norm(points[:, None] - points[None, :], axis=2)
+    nearest = np.argsort(distances, axis=1)[:, 1:NEAREST_NEIGHBORS + 1]
+    edges = list({tuple(sorted((i + 1, j + 1))) for i in range(n) for j in nearest[i]})
+    layout = {i + 1: np.append(point, 0) for i, point in enumerate(points)}
+    return Graph(list(layout), edges, layout=layout, vertex_config={"radius": 0.04})
+
+
+def get_connected_vertices(graph: Graph, size: int) -> list[Hashable]:
+    """size vertices (at most) in breadth first order from the first vertex"""
+    first = next(iter(graph.vertices))
+    order, seen = [first], {first}
+    for vertex in order:
+        for neighbor in graph.get_neighbors(vertex):
+            if neighbor not in seen and len(order) < size:
+                seen.add(neighbor)
+                order.append(neighbor)
+    return order
+
+
+class TreeNode:
+    """Just the links the tree layout reads, so large trees don't build mobjects"""
+    __slots__ = ("key", "left", "right")
+
+    def __init__(self, key):
+        self.key, self.left, self.right = key, None, None
+
+
+def get_random_tree(n: int, seed: int = 0) -> TreeNode:
+    """The binary search tree of n keys inserted in random order"""
+    keys = np.random.default_rng(seed).permutation(n).tolist()
+    root = TreeNode(keys[0])
+    for key in keys[1:]:
+        node = root
+        while True:
+            side = "left" if key < node.key else "right"
+            if getattr(node, side) is None:
+                setattr(node, side, TreeNode(key))
+                break
+            node = getattr(node, side)
+    return root
+
+
+def get_path_tree(n: int) -> TreeNode:
+    """The binary search tree of n sorted keys, a path of depth n - 1"""
+    root = node = TreeNode(0)
+    for key in range(1, n):
+        node.right = TreeNode(key)
+        node = node.right
+    return root
+
+
+def timed(func: Callable, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def benchmark_cuts(sizes: tuple[int] = CUT_BENCHMARK_SIZES, seed: int = 0) -> list[dict]:
+    """
+    Per graph size: the voronoi cells (computed once per graph), a cut from scratch with get_vertices_cut, the same
+    cut grown vertex by vertex with IncrementalCuts, and the triangles among the neighbor cells of the cut.
+    """
+    results = []
+    for n in sizes:
+        graph = get_random_graph(n, seed)
+        vertices = get_connected_vertices(graph, max(2, int(n * CUT_FRACTION)))
+        result = {"vertices": n, "cut": len(vertices)}
+        result["voronoi_seconds"] = timed(get_vertices_voronoi_cells, graph, round_radius=0,
+                                          buff=next(iter(graph.vertices.values())).get_width() * 2)
+        result["cut_seconds"] = timed(get_vertices_cut, graph, vertices)
+        cuts = IncrementalCuts(graph)
+        cuts.update_cells()
+        result["incremental_seconds"] = sum(timed(cuts.get_cut, vertices[:i]) for i in range(2, len(vertices) + 1))
+        cells = get_vertices_voronoi_cells(graph, vertices, round_radius=0)
+        neighbors_edges = {(a, b) for a in vertices for b in vertices if a != b and
+                           len(get_tangent_points(cells[a], cells[b])) >= 2}
+        result["triangles_seconds"] = timed(find_all_triangular_in_vertives_set, neighbors_edges, vertices)
+        results.append(result)
+    print_results(results)
+    return results
+
+
+def benchmark_bst_layout(sizes: tuple[int] = BST_BENCHMARK_SIZES, seed: int = 0) -> list[dict]:
+    """The columns of the tree layout, on a random tree and on a path (sorted keys) per size"""
+    results = []
+    for n in sizes:
+        results.append({"keys": n, "random_seconds": timed(get_tree_columns, get_random_tree(n, seed)),
+                        "path_seconds": timed(get_tree_columns, get_path_tree(n))})
+    print_results(results)
+    return results
+
+
+def get_brute_force_repulsion(positions: np.ndarray, k: float) -> np.ndarray:
+    """The k^2/d repulsion of force_layout between every pair of vertices, O(V^2)"""
+    delta = positions[:, None, :] - positions[None, :, :]
+    distance2 = np.maximum(np.einsum("ijk,ijk->ij", delta, delta), MIN_DISTANCE ** 2)
+    np.fill_diagonal(distance2, np.inf)
+    return np.einsum("ijk,ij->ik", delta, k ** 2 / distance2)
+
+
+def get_repulsion_error(n: int, seed: int = 0) -> float:
+    """Relative error of the grid repulsion against the brute force one, on n random positions"""
+    positions = np.random.default_rng(seed).random((n, 2))
+    k = 1 / np.sqrt(n)
+    brute_force = get_brute_force_repulsion(positions, k)
+    return np.linalg.norm(_get_repulsion(positions, k) - brute_force) / np.linalg.norm(brute_force)
+
+
+def check_force_repulsion(sizes: tuple[int] = FORCE_BENCHMARK_SIZES, seed: int = 0,
+                          rtol: float = FORCE_REPULSION_RTOL):
+    """Raise if the grid repulsion of force_layout strays from the brute force one (e.g. a broken neighbor cell)"""
+    for n in sizes:
+        error = get_repulsion_error(n, seed)
+        if not error <= rtol:
+            raise AssertionError(f"Grid repulsion of {n} vertices is {error:.1%} off the brute force one "
+                                 f"(tolerance {rtol:.1%})")
+
+
+def benchmark_force_layout(sizes: tuple[int] = FORCE_BENCHMARK_SIZES, seed: int = 0) -> list[dict]:
+    """
+    Per graph size: one repulsion step on the grid and by brute force (and the error between them), and a full
+    force_layout of a random graph. Checks the repulsion first, see check_force_repulsion.
+    """
+    check_force_repulsion(sizes, seed)
+    results = []
+    for n in sizes:
+        positions = np.random.default_rng(seed).random((n, 2))
+        nx_graph = nx.gnm_random_graph(n, n * FORCE_EDGES_PER_VERTEX, seed=seed)
+        results.append({"vertices": n,
+                        "grid_repulsion_seconds": timed(_get_repulsion, positions, 1 / np.sqrt(n)),
+                        "brute_repulsion_seconds": timed(get_brute_force_repulsion, positions, 1 / np.sqrt(n)),
+                        "repulsion_error": get_repulsion_error(n, seed),
+                        "layout_seconds": timed(force_layout, nx_graph, seed=seed)})
+    print_results(results)
+    return results
+
+
+def print_results(results: list[dict]):
+    columns = list(results[0])
+    print(" | ".join(f"{column:>19}" for column in columns))
+    for result in results:
+        print(" | ".join(f"{result[column]:>19.4f}" if isinstance(result[column], float) else
+                         f"{result[column]:>19}" for column in columns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the graph helpers on random graphs and trees")
+    parser.add_argument("--sizes", type=int, nargs="+", default=CUT_BENCHMARK_SIZES)
+    parser.add_argument("--bst-sizes", type=int, nargs="+", default=BST_BENCHMARK_SIZES)
+    parser.add_argument("--force-sizes", type=int, nargs="+", default=FORCE_BENCHMARK_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark_cuts(tuple(args.sizes), args.seed)
+    benchmark_bst_layout(tuple(args.bst_sizes), args.seed)
+    benchmark_force_layout(tuple(args.force_sizes), args.seed)
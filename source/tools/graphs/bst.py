@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from typing import Iterable, Iterator
+
 from .node import *
 from .edge import *
 
+TRAVERSAL_ORDERS = ("pre", "in", "post", "level")
+
 BST_WEIGHT_COLOR = WHITE
 BST_WEIGHT_FONT_COLOR = BLACK
 
@@ -26,28 +30,39 @@ class BST(VGroup):
         self.tree_height = tree_height
         self.extra_space_at_top = extra_space_at_top
         self.node_type = node_type
+        self.tree_columns = TreeColumns()
+        self._layout_changes = set()  # nodes whose children changed since the last layout
+        self._layout_params = None
         if keys is not None:
             self.insert_keys(keys, set_root=True)
             self.create_tree()
         self.add_updater(self.update_edges)
 
+    def _create_node(self, key: int | Node, parent: Node = None) -> Node:
+        node = key if isinstance(key, Node) else self.node_type(key)
+        if parent is not None:
+            node.parent = parent
+            self.mark_layout_change(parent)
+        self.nodes += node
+        self.add(node)
+        return node
+
     def _insert_key(self, key: int | Node, node: Node = None, parent: Node = None, **kwargs) -> Node:
+        """Inserts the key as a leaf of the sub-tree of node (the new node if there is no node), returns node"""
         if node is None:
-            ret_key = key if isinstance(key, Node) else self.node_type(key)
-            if parent != None:
-                ret_key.parent = parent
-            self.nodes += ret_key
-            self.add(ret_key)
-            return ret_key
-
-        if key < node:
-            node.left = self._insert_key(key, node.left, node, **kwargs)
-        else:
-            node.right = self._insert_key(key, node.right, node, **kwargs)
+            return self._create_node(key, parent)
+
+        current = node
+        while True:
+            side = "left" if key < current else "right"
+            if getattr(current, side) is None:
+                break
+            current = getattr(current, side)
+        setattr(current, side, self._create_node(key, current))
         return node
 
     def insert_keys(self, keys: list | int, set_root=False, **kwargs):
-        """Inserts a list of keys into the BST recursively"""
+        """Inserts a list of keys into the BST one by one"""
         keys = [keys] if isinstance(keys, int) else keys
         nodes = []
         for key in keys:
@@ -69,22 +84,18 @@ class BST(VGroup):
 
     def search(self, key: int | Node) -> tuple[Node | None, list[Any]]:
         """Returns a list of nodes containing the path from root to target node"""
-        path = []
-
-        def search_helper(node: Node, key: int) -> Optional[Node]:
-            if node is None:
-                return None
+        path, node = [], self.root
+        while node is not None:
             path.append(node)
             if key < node:
-                return search_helper(node.left, key)
+                node = node.left
             elif key > node:
-                return search_helper(node.right, key)
+                node = node.right
             elif node.right is not None and node.right.key == key:
-                return search_helper(node.right, key)
+                node = node.right
             else:
-                return node
-
-        return search_helper(self.root, key), path
+                return node, path
+        return None, path
 
     def delete_key(self, key: Node | float | int) -> tuple[Node | None, Node | None, Edge | None, Edge | None] | None:
         # TODO: update heights and remove edges and node from self and self.edges
@@ -136,6 +147,7 @@ class BST(VGroup):
         return remove_edge, update_edge
 
     def transplant(self, u: Node, v: Node):
+        self.mark_layout_change(u, u.parent, v)
         if u.parent is None:
             self.root = v
             self.root.parent = None
@@ -158,13 +170,18 @@ class BST(VGroup):
         self.traverse_sub_tree(self.root, func, **kwargs)
 
     def traverse_sub_tree(self, node: Node, func, **kwargs):
-        if node is None:
+        """Calls func on every node of the sub-tree in pre-order. A depth kwarg is increased with the depth."""
+        if "depth" not in kwargs:
+            for current_node in iter_tree(node):
+                func(current_node, **kwargs)
             return
-        func(node, **kwargs)
-        if "depth" in kwargs:
-            kwargs["depth"] += 1
-        self.traverse_sub_tree(node.left, func, **kwargs)
-        self.traverse_sub_tree(node.right, func, **kwargs)
+        start_depth = kwargs.pop("depth")
+        for current_node, depth in iter_tree(node, with_depth=True):
+            func(current_node, depth=start_depth + depth, **kwargs)
+
+    def iter_nodes(self, order: str = "pre", node: Node = None, with_depth: bool = False) -> Iterator:
+        """The nodes of the tree (or of the sub-tree of node) in the given order, see iter_tree"""
+        return iter_tree(self.root if node is None else node, order, with_depth)
 
     def minimum(self, node: Node) -> Node:
         """Returns the minimum node in the sub-tree"""
@@ -174,23 +191,26 @@ class BST(VGroup):
 
     # ----------------- Layout ----------------- #
 
-    def set_layout(self, relative_to_root: bool = False, relative_x: float = 0, relative_y: float = 0):
+    def mark_layout_change(self, *nodes: Node):
+        """Marks nodes whose children changed (or that were removed), the next layout redoes only their paths"""
+        self._layout_changes.update(node for node in nodes if node is not None)
+
+    def set_layout(self, relative_to_root: bool = False, relative_x: float = 0, relative_y: float = 0) -> list[Node]:
         """
         Positions the nodes of the given binary search tree in a way that
         minimizes overlap and maximizes horizontal distance.
-        :param bst: the binary search tree to position.
-        :return:
+        Only the paths changed since the last layout are merged again (see TreeColumns), and while the bounding box
+        of the columns and the depth stay the same only the nodes whose column or depth changed get new positions.
+        :return: The nodes that are not at their new position.
         """
-        relative_cols_positions = {}
+        changed, self._layout_changes = self._layout_changes, set()
+        moved_nodes = self.tree_columns.update(self.root, changed)
+        relative_cols_positions = self.tree_columns.columns
 
-        get_column_positions_from_root(self.root, 0, relative_cols_positions)
-
-        eliminate_overlap(self.root, relative_cols_positions, self)
-
-        num_cols = max(relative_cols_positions.values()) - min(relative_cols_positions.values()) + 1
+        minimum_position, maximum_position = self.tree_columns.get_columns_range()
+        num_cols = maximum_position - minimum_position + 1
         horiz_increment = self.tree_width / (num_cols + 1)
-        vert_increment = self.tree_height / (get_depth(self.root) + 1 + self.extra_space_at_top)
-        minimum_position = min(relative_cols_positions.values())
+        vert_increment = self.tree_height / (self.tree_columns.get_height() + 1 + self.extra_space_at_top)
 
         if self.extra_space_at_top:
             self.tree_top -= vert_increment
@@ -202,15 +222,32 @@ class BST(VGroup):
                 relative_cols_positions[self.root] - minimum_position + 1))) if correct_relative_pos else 0
         shift_y = (relative_y - (self.tree_top - vert_increment)) if correct_relative_pos else 0
 
-        def locate_nodes(current_node: Node, depth: int, layout: dict[Node, np.ndarray]):
-            """Converts the relative horizontal coordinates to circle objects in the canvas"""
+        layout_params = (self.tree_left, self.tree_top, horiz_increment, vert_increment, minimum_position, shift_x,
+                         shift_y)
+        # a tree moved as a whole (e.g. to_edge) is laid out again everywhere
+        partial = self.layout is not None and layout_params == self._layout_params and \
+                  self.root not in moved_nodes and self.root in self.layout and \
+                  np.allclose(self.root.get_center(), self.layout[self.root])
+        if not partial:
+            self.layout, layout_nodes = {}, self.iter_nodes()
+        else:
+            for node in changed.difference(relative_cols_positions):
+                self.layout.pop(node, None)
+            layout_nodes = moved_nodes
+        self._layout_params = layout_params
+
+        moved = []
+        for current_node in layout_nodes:
+            if current_node not in relative_cols_positions:
+                continue
+            # converts the relative horizontal coordinates to circle objects in the canvas
             x_coord = self.tree_left + (
                     relative_cols_positions[current_node] - minimum_position + 1) * horiz_increment + shift_x
-            y_coord = self.tree_top - (depth + 1) * vert_increment + shift_y
-            layout[current_node] = RIGHT * x_coord + UP * y_coord
-
-        self.layout = {}
-        self.traverse(locate_nodes, depth=0, layout=self.layout)
+            y_coord = self.tree_top - (self.tree_columns.depths[current_node] + 1) * vert_increment + shift_y
+            self.layout[current_node] = RIGHT * x_coord + UP * y_coord
+            if not np.allclose(current_node.get_center(), self.layout[current_node]):
+                moved.append(current_node)
+        return moved
 
     # ----------------- Draw ----------------- #
 
@@ -239,9 +276,22 @@ class BST(VGroup):
         for node in self.nodes:
             node.move_to(self.layout[node])
 
-    def update_tree_layout(self, relative_to_root: bool = False, relative_x: float = 0, relative_y: float = 0):
-        self.set_layout(relative_to_root, relative_x, relative_y)
-        self.update_nodes()
+    def update_tree_layout(self, relative_to_root: bool = False, relative_x: float = 0,
+                           relative_y: float = 0) -> list[Node]:
+        """Moves the nodes whose position changed to the new layout, returns them"""
+        moved = self.set_layout(relative_to_root, relative_x, relative_y)
+        for node in moved:
+            node.move_to(self.layout[node])
+        return moved
+
+    def animate_tree_layout(self, relative_to_root: bool = False, relative_x: float = 0, relative_y: float = 0,
+                            **kwargs) -> Animation:
+        """Animates only the nodes whose position changed to the new layout, the edges follow with update_edges"""
+        moved = self.set_layout(relative_to_root, relative_x, relative_y)
+        if not moved:
+            return Wait(**kwargs)
+        return AnimationGroup(*[node.animate.move_to(self.layout[node]) for node in moved], group=self,
+                              suspend_mobject_updating=False, **kwargs)
 
     def update_edges(self, graph):
         for (u, v), edge in graph.edges.items():
@@ -255,64 +305,210 @@ class BST(VGroup):
                 edge.weight_mob.move_to(edge.get_center())
 
 
-def get_depth(current_node: Node):
-    """Returns the depth of the current subtree"""
-    if current_node is None:
-        return 0
-    return 1 + max(get_depth(current_node.left), get_depth(current_node.right))
-
-
-def get_column_positions_from_root(current_node: Node, current_pos: int, relative_positions: dict[Node, int]):
-    """Assigns relative column positions to each node, with no regard for overlap"""
-    if current_node is None:
-        return
-
-    relative_positions[current_node] = current_pos
-    get_column_positions_from_root(current_node.left, current_pos - 1, relative_positions)
-    get_column_positions_from_root(current_node.right, current_pos + 1, relative_positions)
-
-
-def eliminate_overlap(current_node: Node, relative_positions: dict[Node, int], bst: BST):
-    """Recursively shifts the tree to eliminate overlaps and enforce a minimum horizontal distance
-     between nodes from the bottom up"""
-    if current_node is None:
-        return
-
-    eliminate_overlap(current_node.left, relative_positions, bst)
-    eliminate_overlap(current_node.right, relative_positions, bst)
-
-    rightmost_in_left, leftmost_in_right = {}, {}
-
-    def update_depth_col(node: Node, depth: int, depth_to_most_col: dict[int, int], rightmost: bool,
-                         relative_positions: dict[Node, int], **kwargs):
-        operator = max if rightmost else min
-
-        depth_to_most_col[depth] = operator(depth_to_most_col[depth], relative_positions[
-            node]) if depth in depth_to_most_col.keys() else relative_positions[node]
-
-    bst.traverse_sub_tree(current_node.left, update_depth_col, depth=0, depth_to_most_col=rightmost_in_left,
-                          rightmost=True, relative_positions=relative_positions)
-    bst.traverse_sub_tree(current_node.right, update_depth_col, depth=0, depth_to_most_col=leftmost_in_right,
-                          rightmost=False, relative_positions=relative_positions)
-
-    overlap_given_depth = {depth: rightmost_in_left[depth] - leftmost_in_right[depth]
-                           for depth in set(rightmost_in_left.keys()).intersection(leftmost_in_right.keys())}
-
-    if len(overlap_given_depth) == 0:
+def iter_tree(root: Node, order: str = "pre", with_depth: bool = False) -> Iterator:
+    """
+    Iterates over the sub-tree of root without recursion, so degenerate trees of any depth are fine.
+    :param order: One of TRAVERSAL_ORDERS: pre, in, post (depth first) or level (breadth first).
+    :param with_depth: Yield (node, depth) pairs, depth relative to root.
+    """
+    if order not in TRAVERSAL_ORDERS:
+        raise ValueError(f"Unknown traversal order '{order}', available: {TRAVERSAL_ORDERS}")
+    if root is None:
         return
+    items = {"pre": _pre_order, "in": _in_order, "post": _post_order, "level": _level_order}[order](root)
+    if with_depth:
+        yield from items
+    else:
+        for node, _ in items:
+            yield node
+
+
+def _pre_order(root: Node) -> Iterator[tuple[Node, int]]:
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        yield node, depth
+        for child in (node.right, node.left):
+            if child is not None:
+                stack.append((child, depth + 1))
+
+
+def _in_order(root: Node) -> Iterator[tuple[Node, int]]:
+    stack, node, depth = [], root, 0
+    while stack or node is not None:
+        while node is not None:
+            stack.append((node, depth))
+            node, depth = node.left, depth + 1
+        node, depth = stack.pop()
+        yield node, depth
+        node, depth = node.right, depth + 1
+
+
+def _post_order(root: Node) -> Iterator[tuple[Node, int]]:
+    stack = [(root, 0, False)]
+    while stack:
+        node, depth, children_done = stack.pop()
+        if children_done:
+            yield node, depth
+            continue
+        stack.append((node, depth, True))
+        for child in (node.right, node.left):
+            if child is not None:
+                stack.append((child, depth + 1, False))
+
+
+def _level_order(root: Node) -> Iterator[tuple[Node, int]]:
+    level, depth = [root], 0
+    while level:
+        yield from ((node, depth) for node in level)
+        level = [child for node in level for child in (node.left, node.right) if child is not None]
+        depth += 1
 
-    amount_to_shift = max(overlap_given_depth.values()) / 2 + 1
-
-    shift_tree_cols(bst, amount_to_shift, relative_positions, current_node)
 
+def get_depth(current_node: Node):
+    """Returns the depth of the current subtree"""
+    return max((depth + 1 for _, depth in iter_tree(current_node, with_depth=True)), default=0)
+
+
+def get_tree_columns(root: Node) -> dict[Node, float]:
+    """
+    Relative columns of the nodes (Reingold-Tilford): a child starts a column away from its parent, and the two
+    subtrees of a node are pushed apart symmetrically until their facing contours are two columns apart at the
+    closest common depth. The contours are lists from the deepest level up with a lazy offset, so merging two costs
+    the height of the shallower subtree, O(n) overall.
+    """
+    tree_columns = TreeColumns()
+    tree_columns.update(root)
+    return tree_columns.columns
+
+
+class TreeColumns:
+    """
+    The columns (get_tree_columns) and depths of a tree, with the layout data of every sub-tree kept between updates.
+    After an insert, delete or rotation only the nodes on the changed paths are merged again, and only the sub-trees
+    whose column or depth changed are walked.
+    A node reuses the contour list of its deeper child, so it also keeps the entries it overwrote (and the length it
+    appended at), to give the list back to the child when the node is merged again.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.columns = {}  # node -> column, the root keeps its column between updates
+        self.depths = {}
+        self._offsets = {}  # node -> column relative to its parent
+        self._contours = {}  # node -> its (left, right) contours, each a [columns from the deepest level up, offset]
+        self._undo = {}  # node -> per side (the reused list, its length before the node, the overwritten entries)
 
-def shift_tree_cols(bst: BST, amount_to_shift: float, relative_positions: dict[Node, int], node=None):
-    """Shifts the entire tree to the right by some given amount (could be negative)"""
-    node = node if node is not None else bst.root
-    shift_func = lambda pos_node, amount_to_shift, **kwargs: relative_positions.update(
-        {pos_node: relative_positions[pos_node] + amount_to_shift})
-    bst.traverse_sub_tree(node.left, shift_func, amount_to_shift=- amount_to_shift)
-    bst.traverse_sub_tree(node.right, shift_func, amount_to_shift=amount_to_shift)
+    def update(self, root: Node, changed: Iterable[Node] = None) -> set[Node]:
+        """
+        :param changed: Nodes whose children changed since the last update, and removed nodes. Their ancestors
+            (through the parent links) are merged again. None merges every node.
+        :return: The nodes whose column or depth changed, new nodes included.
+        """
+        if changed is None or self.root is None:
+            self._offsets, self._contours, self._undo = {}, {}, {}
+            order = list(iter_tree(root, "level"))
+            dirty = set(order)
+        else:
+            dirty = set()
+            for node in changed:
+                while node is not None and node not in dirty:
+                    dirty.add(node)
+                    node = node.parent
+            # from the top down, so every list is back to the one of the highest node that keeps its contours
+            for node in sorted((node for node in dirty if node in self._undo), key=self.depths.get):
+                self._restore(node)
+            order = [root] if root is not None and (root in dirty or root not in self._contours) else []
+            for node in order:
+                for child in (node.left, node.right):
+                    if child is not None and (child in dirty or child not in self._contours):  # new nodes too
+                        dirty.add(child)
+                        order.append(child)
+        for node in reversed(order):
+            self._merge(node)
+
+        moved = set()
+        if order:
+            self._place(root, self.columns.get(root, 0), 0, moved)
+        for node in order:
+            for child in (node.left, node.right):
+                if child is None:
+                    continue
+                column, depth = self.columns[node] + self._offsets[child], self.depths[node] + 1
+                if child in dirty:
+                    self._place(child, column, depth, moved)
+                elif column != self.columns[child] or depth != self.depths[child]:
+                    column_shift, depth_shift = column - self.columns[child], depth - self.depths[child]
+                    for sub_node in iter_tree(child):
+                        self._place(sub_node, self.columns[sub_node] + column_shift,
+                                    self.depths[sub_node] + depth_shift, moved)
+
+        removed = dirty.difference(order) if changed is not None else set(self.columns).difference(order)
+        for node in removed:
+            for cache in (self.columns, self.depths, self._offsets, self._contours, self._undo):
+                cache.pop(node, None)
+        self.root = root
+        return moved - removed
+
+    def get_columns_range(self) -> tuple[float, float]:
+        """The leftmost and rightmost columns, from the contours of the root"""
+        (left_values, left_add), (right_values, right_add) = self._contours[self.root]
+        return self.columns[self.root] + min(left_values) + left_add, \
+               self.columns[self.root] + max(right_values) + right_add
+
+    def get_height(self) -> int:
+        """Number of levels of the tree (get_depth)"""
+        return len(self._contours[self.root][0][0]) if self.root is not None else 0
+
+    def _place(self, node: Node, column: float, depth: int, moved: set[Node]):
+        if self.columns.get(node) != column or self.depths.get(node) != depth:
+            moved.add(node)
+        self.columns[node], self.depths[node] = column, depth
+
+    def _restore(self, node: Node):
+        for values, length, overwritten in self._undo.pop(node):
+            for index, value in overwritten:
+                values[index] = value
+            del values[length:]
+
+    def _merge(self, node: Node):
+        left, right = self._contours.get(node.left), self._contours.get(node.right)
+        if left is not None and right is not None:
+            common = min(len(left[1][0]), len(right[0][0]))
+            separation = max(left[1][0][-1 - d] + left[1][1] - right[0][0][-1 - d] - right[0][1] for d in range(common))
+            self._offsets[node.left], self._offsets[node.right] = -1 - separation / 2, 1 + separation / 2
+        elif left is not None:
+            self._offsets[node.left] = -1
+        elif right is not None:
+            self._offsets[node.right] = 1
+        children_contours = [(contour, self._offsets[child]) for child, contour in
+                             ((node.left, left), (node.right, right)) if contour is not None]
+        (left_contour, left_undo), (right_contour, right_undo) = \
+            merge_contours([(contour[0], offset) for contour, offset in children_contours], min), \
+            merge_contours([(contour[1], offset) for contour, offset in children_contours], max)
+        self._contours[node] = (left_contour, right_contour)
+        self._undo[node] = [undo for undo in (left_undo, right_undo) if undo is not None]
+
+
+def merge_contours(contours: list[tuple[list, float]], operator) -> tuple[list, tuple | None]:
+    """
+    The contour of a node from the contours of its children (and their offsets from it). The deeper contour is
+    reused, only the levels of the shallower one are compared.
+    :return: The contour, and how to undo the changes to the reused list: (list, length, [(index, old value)]).
+    """
+    if not contours:
+        return [[0], 0], None
+    contours = sorted(contours, key=lambda contour: len(contour[0][0]), reverse=True)
+    (values, add), deep_offset = contours[0]
+    add += deep_offset
+    length, overwritten = len(values), []
+    for (shallow_values, shallow_add), shallow_offset in contours[1:]:
+        for d in range(len(shallow_values)):
+            overwritten.append((length - 1 - d, values[length - 1 - d]))
+            values[length - 1 - d] = operator(values[length - 1 - d] + add,
+                                              shallow_values[-1 - d] + shallow_add + shallow_offset) - add
+    values.append(-add)  # the node itself, at column 0
+    return [values, add], (values, length, overwritten)
 
 
 def create_bst_weight(weight: str | LabeledDot, relative_node: Node, **kwargs) -> LabeledDot:
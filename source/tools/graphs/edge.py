@@ -28,6 +28,7 @@ class Edge(VGroup):
         self.weight_mob = None
         self.weight = None
         self.weight_relative_position = weight_relative_position
+        self.bundled_in = None  # (graph weakref, edge key) while the graph draws this edge in its edges_bundle
 
         self.add(self.edge_line)
         if weight is not None:
@@ -111,6 +112,7 @@ class Edge(VGroup):
                                 time_width: float = 0.1, opposite_direction=False, preserve_state=False,
                                 **kwargs) -> AnimationGroup:
         # Note: not working if edges updater in graph is not removed
+        self.promote()
         self.fix_z_index()
         copy_line = self.edge_line.copy()
         if opposite_direction:
@@ -124,6 +126,34 @@ class Edge(VGroup):
 
         return AnimationGroup(*animations, **kwargs, group=self)
 
+    def promote(self):
+        """
+        Take the edge out of the edges_bundle of its graph (see GenericGraph.promote_edges), as it is about to be
+        styled or animated. Called by set_color, set_stroke, set_opacity, animate and animate_move_along_path.
+        """
+        # also called by the VGroup constructor, before bundled_in is set
+        bundled_in = getattr(self, "bundled_in", None)
+        if bundled_in is None:
+            return
+        graph_ref, edge = bundled_in
+        graph = graph_ref()
+        # copies of the edge (and the edges of a copied graph) keep the reference of the original
+        if graph is not None and graph.edges.get_mobject(edge) is self:
+            graph.promote_edges(edge)
+
+    @property
+    def animate(self):
+        self.promote()
+        return super().animate
+
+    def set_stroke(self, *args, **kwargs):
+        self.promote()
+        return super().set_stroke(*args, **kwargs)
+
+    def set_opacity(self, *args, **kwargs):
+        self.promote()
+        return super().set_opacity(*args, **kwargs)
+
     def pop_tips(self):
         return self.edge_line.pop_tips()
 
@@ -135,6 +165,7 @@ class Edge(VGroup):
         return self.edge_line.get_color()
 
     def set_color(self, *args, **kwargs):
+        self.promote()
         self.edge_line.set_color(*args, **kwargs)
         return self
 
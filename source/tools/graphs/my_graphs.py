@@ -4,14 +4,18 @@ from __future__ import annotations
 
 __all__ = ["Graph", "DiGraph", "WeightedGraph"]
 
+import hashlib
 import itertools as it
+import json
+import os
+import weakref
 from copy import copy
 from enum import Enum
-from typing import Hashable, Iterable
+from typing import Callable, Hashable, Iterable
 import networkx as nx
 import numpy as np
-from manim import LEFT, RIGHT, UP, DOWN, ORIGIN, UL, UR, DL, DR
-from manim.animation.composition import AnimationGroup
+from manim import LEFT, RIGHT, UP, DOWN, ORIGIN, UL, UR, DL, DR, logger
+from manim.animation.composition import AnimationGroup, Succession
 from manim.animation.creation import Create, Uncreate, Write
 from manim.animation.growing import GrowFromPoint, GrowFromEdge
 from manim.mobject.geometry.arc import Dot, LabeledDot, ArcBetweenPoints
@@ -27,8 +31,22 @@ from manim.constants import DEFAULT_ARROW_TIP_LENGTH
 
 from .node import Node, IndicateNode
 from .edge import Edge
+from .force_layout import force_layout
+from .. import consts
 from ..consts import WEIGHT_LABEL_FONT_COLOR, WEIGHT_CONFIG, WEIGHT_SCALE, WEIGHT_LABEL_SCALE
 
+# layouts that are expensive (and random, unless seeded) to compute, kept on disk in consts.LAYOUT_CACHE_PATH
+CACHED_LAYOUTS = ("spring", "kamada_kawai", "spectral", "force")
+MAX_CACHED_LAYOUTS = 512  # the least recently used layouts are evicted beyond it
+# hops around the added vertices and edges that the incremental layout may move, see GenericGraph.incremental_layout
+INCREMENTAL_LAYOUT_DEPTH = 1
+# smaller moves of existing vertices are dropped, so only the vertices that make room are animated
+INCREMENTAL_LAYOUT_MIN_MOVE = 0.05
+INCREMENTAL_LAYOUT_SEED = 0
+MAX_CACHED_VERTICES_RANKS = 8  # priority lists whose ranks get_vertices_rank keeps
+# positions of the 4 points of a straight line (a single cubic bezier) between its start and end
+LINE_POINTS_ALPHAS = np.array([0, 1 / 3, 2 / 3, 1])
+
 
 class GraphType(Enum):
     UNDIRECTED = nx.Graph
@@ -54,6 +72,7 @@ def _determine_graph_layout(
         "tree": _tree_layout,
         "spiral": nx.layout.spiral_layout,
         "spring": nx.layout.spring_layout,
+        "force": force_layout,
     }
 
     custom_layouts = ["random", "partite", "tree"]
@@ -64,9 +83,13 @@ def _determine_graph_layout(
     if isinstance(layout, dict):
         return layout
     elif layout in automatic_layouts and layout not in custom_layouts:
-        auto_layout = automatic_layouts[layout](
-            nx_graph, scale=layout_scale, **layout_config
-        )
+        cache_key = _get_layout_cache_key(nx_graph, layout, layout_scale, layout_config)
+        auto_layout = _load_cached_layout(nx_graph, cache_key)
+        if auto_layout is None:
+            auto_layout = automatic_layouts[layout](
+                nx_graph, scale=layout_scale, **layout_config
+            )
+            _save_cached_layout(nx_graph, cache_key, auto_layout)
         # NetworkX returns a dictionary of 3D points if the dimension
         # is specified to be 3. Otherwise, it returns a dictionary of
         # 2D points, so adjusting is required.
@@ -114,6 +137,81 @@ def _determine_graph_layout(
         )
 
 
+def _get_layout_cache_key(nx_graph: nx.classes.graph.Graph | nx.classes.digraph.DiGraph, layout: str,
+                          layout_scale: float | tuple, layout_config: dict) -> str | None:
+    """
+    Hash of everything a cached layout depends on: the vertices and edges (in order, layouts depend on it), the
+    layout, its config (seed included) and scale, and the networkx version. None if the layout isn't cached.
+    """
+    if consts.LAYOUT_CACHE_PATH is None or layout not in CACHED_LAYOUTS:
+        return None
+    key = {"nodes": list(nx_graph.nodes), "edges": list(nx_graph.edges), "directed": nx_graph.is_directed(),
+           "layout": layout, "scale": _get_layout_key_value(layout_scale),
+           "config": {key: _get_layout_key_value(value) for key, value in layout_config.items()},
+           "networkx": nx.__version__}
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def _get_layout_key_value(value):
+    """
+    A json friendly value for the layout cache key. numpy arrays (e.g. the warm start pos of the force layout) are
+    hashed by their bytes, dtype and shape, their repr elides big arrays and rounds the values.
+    """
+    if isinstance(value, np.ndarray):
+        return {"dtype": str(value.dtype), "shape": list(value.shape),
+                "sha256": hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()}
+    if isinstance(value, dict):
+        return [[repr(key), _get_layout_key_value(item)] for key, item in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [_get_layout_key_value(item) for item in value]
+    return repr(value)
+
+
+def _load_cached_layout(nx_graph: nx.classes.graph.Graph | nx.classes.digraph.DiGraph,
+                        cache_key: str | None) -> dict | None:
+    if cache_key is None:
+        return None
+    cache_file = consts.LAYOUT_CACHE_PATH / f"{cache_key}.json"
+    try:
+        with open(cache_file, "r") as f:
+            positions = json.load(f)
+        # the modification time orders the eviction, see _evict_cached_layouts
+        os.utime(cache_file)
+    except FileNotFoundError:  # not cached, or evicted by a parallel render
+        return None
+    return {v: np.array(position) for v, position in zip(nx_graph.nodes, positions)}
+
+
+def _save_cached_layout(nx_graph: nx.classes.graph.Graph | nx.classes.digraph.DiGraph, cache_key: str | None,
+                        auto_layout: dict):
+    """Positions are stored in the order of the vertices, so any hashable vertex type survives the json"""
+    if cache_key is None:
+        return
+    consts.LAYOUT_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    cache_file = consts.LAYOUT_CACHE_PATH / f"{cache_key}.json"
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump([np.asarray(auto_layout[v]).tolist() for v in nx_graph.nodes], f)
+    # atomic, parallel renders may build the same graph at the same time
+    os.replace(tmp_file, cache_file)
+    _evict_cached_layouts()
+
+
+def _evict_cached_layouts(max_layouts: int = MAX_CACHED_LAYOUTS):
+    """Keep only the max_layouts most recently used layouts in consts.LAYOUT_CACHE_PATH"""
+    cache_files = list(consts.LAYOUT_CACHE_PATH.glob("*.json"))
+    if len(cache_files) <= max_layouts:
+        return
+    mtimes = {}
+    for cache_file in cache_files:
+        try:
+            mtimes[cache_file] = cache_file.stat().st_mtime
+        except FileNotFoundError:  # evicted by a parallel render
+            pass
+    for cache_file in sorted(mtimes, key=mtimes.get)[:len(mtimes) - max_layouts]:
+        cache_file.unlink(missing_ok=True)
+
+
 def _tree_layout(
         T: nx.classes.graph.Graph | nx.classes.digraph.DiGraph,
         root_vertex: Hashable | None,
@@ -222,6 +320,61 @@ def _tree_layout(
     return {v: (np.array([x, y, 0]) - center) * sf for v, (x, y) in pos.items()}
 
 
+class EdgesDict(dict):
+    """
+    The edge mobjects of a graph. Reading a bundled edge doesn't promote it out of the graph's edges_bundle (reads
+    like ``graph.edges[edge].get_angle()`` are common), an Edge promotes itself once it is styled or animated (see
+    Edge.promote). Other bundled mobjects can't, reading them warns to promote them with
+    GenericGraph.promote_edges.
+    Every insertion and removal also updates ``adjacency``: vertex -> its out neighbors (v for every (vertex, v)
+    key), and ``predecessors``: vertex -> its in neighbors.
+    """
+
+    def __init__(self, graph: GenericGraph = None):
+        super().__init__()
+        self.graph = graph
+        self.adjacency: dict[Hashable, dict[Hashable, None]] = {}  # dicts as ordered sets
+        self.predecessors: dict[Hashable, dict[Hashable, None]] = {}
+
+    def __setitem__(self, edge: tuple[Hashable, Hashable], mobject: Mobject):
+        super().__setitem__(edge, mobject)
+        # unpickling sets the items before restoring the attributes
+        self.__dict__.setdefault("adjacency", {}).setdefault(edge[0], {})[edge[1]] = None
+        self.__dict__.setdefault("predecessors", {}).setdefault(edge[1], {})[edge[0]] = None
+
+    def __delitem__(self, edge: tuple[Hashable, Hashable]):
+        super().__delitem__(edge)
+        self._remove_adjacency(edge)
+
+    def pop(self, edge: tuple[Hashable, Hashable], *default):
+        had_edge = edge in self
+        mobject = super().pop(edge, *default)
+        if had_edge:
+            self._remove_adjacency(edge)
+        return mobject
+
+    def _remove_adjacency(self, edge: tuple[Hashable, Hashable]):
+        for index, u, v in ((self.adjacency, *edge), (self.predecessors, *edge[::-1])):
+            neighbors = index[u]
+            neighbors.pop(v, None)
+            if not neighbors:
+                del index[u]
+
+    def get_incident_edges(self, vertex: Hashable) -> list[tuple[Hashable, Hashable]]:
+        return [(vertex, v) for v in self.adjacency.get(vertex, ())] + \
+               [(u, vertex) for u in self.predecessors.get(vertex, ())]
+
+    def __getitem__(self, edge: tuple[Hashable, Hashable]) -> Mobject:
+        mobject = super().__getitem__(edge)
+        if self.graph is not None and edge in self.graph.bundled_edges and not isinstance(mobject, Edge):
+            logger.warning(f"Edge {edge} is drawn by edges_bundle, styling it has no effect until it is promoted "
+                           f"with promote_edges")
+        return mobject
+
+    def get_mobject(self, edge: tuple[Hashable, Hashable], default=None) -> Mobject:
+        return super().get(edge, default)
+
+
 class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
     """A graph (that is, a collection of vertices connected with edges).
 
@@ -258,7 +411,8 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
         for automatic vertex positioning using ``networkx``
         (see `their documentation <https://networkx.org/documentation/stable/reference/drawing.html#module-networkx.drawing.layout>`_
         for more details), or a dictionary specifying a coordinate (value)
-        for each vertex (key) for manual positioning.
+        for each vertex (key) for manual positioning. ``"force"`` is a grid accelerated spring layout for large
+        graphs (see :func:`~.force_layout.force_layout`), it accepts a warm start ``pos`` in ``layout_config``.
     layout_config
         Only for automatically generated layouts. A dictionary whose entries
         are passed as keyword arguments to the automatic layout algorithm
@@ -295,6 +449,19 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
         keys are the edges, and whose values are dictionaries containing
         keyword arguments for the mobject related to the corresponding edge.
         In the case of a directed graph you can further customize the tip by adding a `tip_config` dict for global styling, or by adding the dict to a specific edge_config. See examples below.
+    bundle_edges
+        Draw all the straight, unweighted edges that share the most common style as a single merged
+        :class:`~.VMobject` (``edges_bundle``) whose points are rebuilt in bulk, instead of one mobject per edge.
+        Reading ``graph.edges[edge]`` doesn't take an edge out of the bundle. Edges are promoted to their own
+        mobjects when an :class:`~.Edge` is styled or animated (``set_color``, ``set_stroke``, ``set_opacity``,
+        ``animate``, ``animate_move_along_path``), by :meth:`add_edges` when an edge is added again with its own
+        config (e.g. a color), and explicitly with :meth:`promote_edges`, which other edge types need before styling
+        (reading them warns).
+    incremental_layout
+        Place the vertices added by :meth:`add_vertices` and :meth:`add_edges` (unless given positions) with the
+        ``"force"`` layout warm started from the current positions, letting only the existing vertices near the new
+        vertices and edges move to make room (see :meth:`get_incremental_layout`). Animated additions create the
+        new mobjects and then move just the vertices that moved.
 
     Examples
     --------
@@ -523,6 +690,8 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
             root_vertex: Hashable | None = None,
             edge_config: dict | None = None,
             graph_type: GraphType = GraphType.UNDIRECTED,
+            bundle_edges: bool = False,
+            incremental_layout: bool = False,
     ) -> None:
         super().__init__()
         self.graph_type = graph_type
@@ -578,8 +747,8 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
         for v, label in self._labels.items():
             self._vertex_config[v]["label"] = label
 
-        self.vertices = {v: vertex_type(**self._vertex_config[v]) for v in vertices}
-        self.vertices.update(vertex_mobjects)
+        self.vertices = {v: vertex_mobjects[v] if v in vertex_mobjects else vertex_type(**self._vertex_config[v])
+                         for v in vertices}
         for v in self.vertices:
             self[v].move_to(self._layout[v])
 
@@ -594,7 +763,8 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
         directed_graph = graph_type == GraphType.DIRECTED
         self.default_edge_config = default_edge_config
 
-        self.edges = {}
+        self.edges = EdgesDict(self)
+        self.bundled_edges = set()
         self._edge_config = {}
         self._tip_config = {}
         self.default_tip_config = self.DEFAULT_TIP_CONFIG
@@ -612,8 +782,15 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
                 self.edges[e] = self.edges[e].add_tip(**self._tip_config[e])
 
         self.add(*self.vertices.values())
-        self.add(*self.edges.values())
-
+        self.edges_bundle = None
+        if bundle_edges:
+            self.create_edges_bundle()
+        self.add(*{id(edge): edge for e, edge in self.edges.items() if e not in self.bundled_edges}.values())
+
+        self._vertices_state = {}  # vertex -> (center, width, height) when its edges were last updated
+        # id(priority) (None for the vertices) -> (priority, its length, vertex -> rank), see get_vertices_rank
+        self._vertices_ranks = {}
+        self.incremental_layout = incremental_layout
         self.add_updater(self.update_edges)
 
     def _add_edge_config(self, e, edge_config):
@@ -637,6 +814,184 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
                 if directed_graph:
                     self._tip_config[e] = copy(self.default_tip_config)
 
+    def get_dirty_edges(self) -> list[tuple[Hashable, Hashable]]:
+        """
+        Edges touching a vertex that moved or changed its size since the last call (all edges on the first call).
+        The edge updaters rebuild only these, so a static graph costs next to nothing per frame.
+        """
+        moved = set()
+        for v, vertex in self.vertices.items():
+            state = (*vertex.get_center(), vertex.width, vertex.height)
+            if self._vertices_state.get(v) != state:
+                self._vertices_state[v] = state
+                moved.add(v)
+        dirty_edges = {}  # dict as an ordered set, an edge between two moved vertices comes up twice
+        for v in moved:
+            dirty_edges.update(dict.fromkeys(self.edges.get_incident_edges(v)))
+        return list(dirty_edges)
+
+    def update_dirty_edges(self, rebuild_edge: Callable[[Hashable, Hashable, Mobject], None]):
+        """
+        The body of the update_edges updaters: the straight dirty edges are put on their vertices in bulk, the others
+        are rebuilt one by one with rebuild_edge(u, v, edge mobject), and the bundle follows.
+        """
+        dirty_edges = self.get_dirty_edges()
+        straight_edges = {e for e in dirty_edges if get_straight_edge_line(self.edges.get_mobject(e)) is not None}
+        self.put_edges_on_vertices([e for e in dirty_edges if e in straight_edges])
+        for u, v in dirty_edges:
+            if (u, v) not in straight_edges:
+                rebuild_edge(u, v, self.edges.get_mobject((u, v)))
+        self.refresh_edges_bundle(dirty_edges)
+
+    def get_neighbors(self, vertex: Hashable, priority: list[Hashable] | dict[Hashable, int] | None = None) -> \
+            list[Hashable]:
+        """
+        The vertices v with an edge (vertex, v), ordered by priority (default: the order of the vertices). Vertices
+        missing from priority are left out. Uses the adjacency index, O(deg log deg) once the ranks of priority are
+        cached (see get_vertices_rank).
+        """
+        rank = self.get_vertices_rank(priority)
+        return sorted((v for v in self.edges.adjacency.get(vertex, ()) if v in rank), key=rank.__getitem__)
+
+    def get_vertices_rank(self, priority: list[Hashable] | dict[Hashable, int] | None = None) -> dict[Hashable, int]:
+        """
+        vertex -> its index in priority (default: the vertices). A dict priority is taken as precomputed ranks. A
+        list is cached by identity and length, so a lookup is O(1): a list that is reordered in place has to be
+        passed as a new list (or as ranks). The ranks of the vertices are dropped when vertices are added or removed.
+        """
+        if isinstance(priority, dict):
+            return priority
+        key = None if priority is None else id(priority)
+        ordered = self.vertices if priority is None else priority
+        # the cache holds priority, so its id isn't reused by another list while cached
+        cached_priority, cached_length, rank = self._vertices_ranks.get(key, (None, None, None))
+        if rank is None or cached_priority is not priority or cached_length != len(ordered):
+            rank = {}
+            for i, v in enumerate(ordered):
+                rank.setdefault(v, i)
+            if len(self._vertices_ranks) >= MAX_CACHED_VERTICES_RANKS:
+                self._vertices_ranks.clear()
+            self._vertices_ranks[key] = (priority, len(ordered), rank)
+        return rank
+
+    def get_incremental_layout(self, vertices: Iterable[Hashable] = (), edges: Iterable[tuple[Hashable, Hashable]] = (),
+                               depth: int = INCREMENTAL_LAYOUT_DEPTH) -> dict[Hashable, np.ndarray]:
+        """
+        Layout of the graph with vertices and edges added (the graph itself isn't changed), warm started from the
+        current positions. Only the new vertices and the existing vertices within depth hops of them or of the new
+        edges are free to move.
+        :return: Positions of the new vertices, and of the existing vertices that moved noticeably.
+        """
+        nx_graph = self._graph.copy()
+        nx_graph.add_nodes_from(vertices)
+        nx_graph.add_edges_from(edges)
+        pos = {v: self[v].get_center() for v in self.vertices}
+        sources = {v for v in nx_graph if v not in pos} | {v for e in edges for v in e}
+        if not sources:
+            return {}
+        free = nx.multi_source_dijkstra_path_length(nx_graph.to_undirected(as_view=True), sources, cutoff=depth,
+                                                    weight=lambda u, v, data: 1)
+        layout = force_layout(nx_graph, pos=pos, fixed=[v for v in pos if v not in free], seed=INCREMENTAL_LAYOUT_SEED)
+        z = self.get_center()[2]
+        return {v: np.append(position, z) for v, position in layout.items()
+                if v not in pos or np.linalg.norm(position - pos[v][:2]) > INCREMENTAL_LAYOUT_MIN_MOVE}
+
+    def mark_edges_dirty(self):
+        """Make the next update_edges rebuild every edge (e.g. after changing edges by hand)"""
+        self._vertices_state.clear()
+
+    def create_edges_bundle(self):
+        """Merge the straight unweighted edges with the most common style into edges_bundle, see bundle_edges"""
+        styles = {}
+        for e in self.edges:
+            line = get_straight_edge_line(self.edges.get_mobject(e))
+            if line is not None and getattr(self.edges.get_mobject(e), "weight_mob", None) is None:
+                styles.setdefault(get_line_style(line), []).append(e)
+        if not styles:
+            return
+        self.bundled_edges = set(max(styles.values(), key=len))
+        for e in self.bundled_edges:
+            # lets the edge promote itself before it is animated, see Edge.animate_move_along_path. A weak reference, so
+            # copying the edge doesn't copy the graph.
+            self.edges.get_mobject(e).bundled_in = (weakref.ref(self), e)
+        line = get_straight_edge_line(self.edges.get_mobject(next(iter(self.bundled_edges))))
+        # the fill only shows on the closed tips, the lines have no area
+        self.edges_bundle = VMobject(stroke_color=line.get_stroke_color(), stroke_width=line.get_stroke_width(),
+                                     stroke_opacity=line.get_stroke_opacity(), fill_color=line.get_stroke_color(),
+                                     fill_opacity=line.get_stroke_opacity() if line.has_tip() else 0)
+        self.edges_bundle.set_z_index(line.z_index)
+        self.add(self.edges_bundle)
+        self.refresh_edges_bundle()
+
+    def refresh_edges_bundle(self, changed_edges: Iterable[tuple[Hashable, Hashable]] = None):
+        """Rebuild the points of edges_bundle from its edges (only if one of changed_edges is bundled)"""
+        if self.edges_bundle is None:
+            return
+        if changed_edges is not None and self.bundled_edges.isdisjoint(changed_edges):
+            return
+        bundled = {id(edge): edge for edge in map(self.edges.get_mobject, self.bundled_edges)}.values()
+        points = [mob.points for edge in bundled for mob in edge.family_members_with_points()]
+        self.edges_bundle.points = np.concatenate(points) if points else np.zeros((0, 3))
+
+    def promote_edges(self, *edges: tuple[Hashable, Hashable]) -> list[Mobject]:
+        """Take edges out of edges_bundle and add them to the graph as their own mobjects"""
+        promoted = []
+        for e in edges:
+            if e not in self.bundled_edges:
+                continue
+            edge = self.edges.get_mobject(e)
+            self.bundled_edges -= {e, e[::-1]} if self.edges.get_mobject(e[::-1], None) is edge else {e}
+            edge.bundled_in = None
+            self.add(edge)
+            promoted.append(edge)
+        if promoted:
+            self.refresh_edges_bundle()
+        return promoted
+
+    def get_edges_start_and_end(self, edges: list[tuple[Hashable, Hashable]]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Start and end points of edges, computed at once from the matrix of vertex centers. Undirected edges join the
+        vertex centers, directed ones the vertex boundaries (the same placement as create_edge).
+        """
+        vertex_index = {v: i for i, v in enumerate(self.vertices)}
+        centers = np.array([vertex.get_center() for vertex in self.vertices.values()])
+        widths = np.array([vertex.width for vertex in self.vertices.values()])
+        u_index = np.array([vertex_index[u] for u, _ in edges])
+        v_index = np.array([vertex_index[v] for _, v in edges])
+        starts, ends = centers[u_index], centers[v_index]
+        if self.graph_type == GraphType.UNDIRECTED:
+            return starts, ends
+        deltas = ends - starts
+        angles = np.arctan2(deltas[:, 1], deltas[:, 0])
+        directions = np.stack([np.cos(angles), np.sin(angles), np.zeros_like(angles)], axis=1)
+        lengths = np.linalg.norm(deltas, axis=1) - (widths[u_index] + widths[v_index]) / 2
+        starts = starts + directions * widths[u_index, None] / 2
+        return starts, starts + directions * lengths[:, None]
+
+    def put_edges_on_vertices(self, edges: list[tuple[Hashable, Hashable]]):
+        """
+        Move straight edges (see get_straight_edge_line) to their vertices by writing the points of all their lines
+        at once. The tips are kept and the weights are put where Edge.update_weight puts them (the center of the line,
+        tip included), the style of the edges is untouched.
+        """
+        if not edges:
+            return
+        starts, ends = self.get_edges_start_and_end(edges)
+        lines_points = starts[:, None, :] + LINE_POINTS_ALPHAS[None, :, None] * (ends - starts)[:, None, :]
+        for (u, v), line_points in zip(edges, lines_points):
+            edge = self.edges.get_mobject((u, v))
+            line = get_straight_edge_line(edge)
+            tip = line.tip if line.has_tip() else None
+            if tip is not None:
+                line.remove(tip)
+            line.points = line_points
+            if tip is not None:
+                line.add_tip(tip)
+            if isinstance(edge, Edge):
+                edge.fix_z_index()
+                if edge.weight_mob is not None:
+                    edge.weight_mob.move_to(line.get_center())
+
     def __getitem__(self: Graph, v: Hashable) -> Mobject:
         return self.vertices[v]
 
@@ -707,6 +1062,7 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
         self.vertices[vertex] = vertex_mobject
         self.vertices[vertex].move_to(position)
         self.add(self.vertices[vertex])
+        self._vertices_ranks.pop(None, None)
 
         return self.vertices[vertex]
 
@@ -776,6 +1132,8 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
 
         graph_center = self.get_center()
         base_positions = {v: graph_center for v in vertices}
+        if self.incremental_layout:
+            base_positions.update(self.get_incremental_layout([v for v in vertices if v not in positions]))
         base_positions.update(positions)
         positions = base_positions
 
@@ -907,6 +1265,8 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
 
         self._graph.remove_node(vertex)
         self._layout.pop(vertex)
+        self._vertices_state.pop(vertex, None)
+        self._vertices_ranks.pop(None, None)
         if vertex in self._labels:
             self._labels.pop(vertex)
         self._vertex_config.pop(vertex)
@@ -916,6 +1276,9 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
             self._edge_config.pop(e)
         to_remove = [self.edges.pop(e) for e in edge_tuples]
         to_remove.append(self.vertices.pop(vertex))
+        if not self.bundled_edges.isdisjoint(edge_tuples):
+            self.bundled_edges.difference_update(edge_tuples)
+            self.refresh_edges_bundle()
 
         self.remove(*to_remove)
         return self.get_group_class()(*to_remove)
@@ -1056,19 +1419,42 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
             A group containing all newly added vertices and edges.
 
         """
+        added_mobjects, moved_vertices = self._add_edges(*edges, edge_type=edge_type, edge_config=edge_config,
+                                                         **kwargs)
+        for v, position in moved_vertices.items():
+            self[v].move_to(position)
+        return added_mobjects
+
+    def _add_edges(
+            self,
+            *edges: tuple[Hashable, Hashable],
+            edge_type: type[Mobject] = Edge,
+            edge_config: dict | None = None,
+            **kwargs,
+    ):
+        """add_edges without moving the existing vertices, returns the added mobjects and where to move them to"""
         if edge_config is None:
             edge_config = {}
 
         for e in edges:
             self._add_edge_config(e, edge_config)
+        # edges added again (e.g. with another color) replace their bundled mobjects
+        self.remove(*self.promote_edges(*(e for e in edges if e in self.bundled_edges)))
 
         edge_vertices = set(it.chain(*edges))
         new_vertices = [v for v in edge_vertices if v not in self.vertices]
+        moved_vertices = {}
+        if self.incremental_layout:
+            layout = self.get_incremental_layout(new_vertices, edges)
+            kwargs["positions"] = {**{v: layout[v] for v in new_vertices}, **(kwargs.get("positions") or {})}
+            moved_vertices = {v: position for v, position in layout.items() if v in self.vertices}
         added_vertices = self.add_vertices(*new_vertices, **kwargs)
 
         added_mobjects = sum((self._add_edge(edge, edge_type=edge_type, edge_config=self._edge_config[edge],
                                              ).submobjects for edge in edges), added_vertices, )
-        return self.get_group_class()(*added_mobjects)
+        for v, position in moved_vertices.items():
+            self._layout[v] = position
+        return self.get_group_class()(*added_mobjects), moved_vertices
 
     @override_animate(add_edges)
     def _add_edges_animation(self, *args, anim_args=None, **kwargs):
@@ -1076,8 +1462,13 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
             anim_args = {}
         animation = anim_args.pop("animation", Create)
 
-        mobjects = self.add_edges(*args, **kwargs)
-        return AnimationGroup(*(animation(mobj, **anim_args) for mobj in mobjects), group=self)
+        mobjects, moved_vertices = self._add_edges(*args, **kwargs)
+        creation = AnimationGroup(*(animation(mobj, **anim_args) for mobj in mobjects), group=self)
+        if not moved_vertices:
+            return creation
+        # the edges follow the moved vertices through update_edges
+        return Succession(creation, AnimationGroup(*(self[v].animate.move_to(position) for v, position in
+                                                     moved_vertices.items())), group=self)
 
     def _remove_edge(self, edge: tuple[Hashable]):
         """Remove an edge from the graph.
@@ -1101,6 +1492,9 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
                 raise ValueError(f"The graph does not contain a edge '{edge}'")
 
         edge_mobject = self.edges.pop(edge)
+        if edge in self.bundled_edges:
+            self.bundled_edges.discard(edge)
+            self.refresh_edges_bundle()
 
         self._graph.remove_edge(*edge)
         self._edge_config.pop(edge, None)
@@ -1223,7 +1617,12 @@ class GenericGraph(VMobject, metaclass=ConvertToOpenGL):
                     self.play(Create(G))
                     self.play(G.animate.change_layout("circular"))
                     self.wait()
+
+        The ``"force"`` layout starts from the current positions of the vertices (unless ``layout_config`` has
+        ``pos``), so it relaxes the current layout instead of replacing it.
         """
+        if layout == "force":
+            layout_config = {"pos": {v: self[v].get_center() for v in self.vertices}, **(layout_config or {})}
         self._layout = _determine_graph_layout(
             self._graph,
             layout=layout,
@@ -1258,6 +1657,8 @@ class Graph(GenericGraph):
             partitions: list[list[Hashable]] | None = None,
             root_vertex: Hashable | None = None,
             edge_config: dict | None = None,
+            bundle_edges: bool = False,
+            incremental_layout: bool = False,
     ) -> None:
         super().__init__(
             vertices,
@@ -1275,12 +1676,16 @@ class Graph(GenericGraph):
             root_vertex,
             edge_config,
             graph_type=GraphType.UNDIRECTED,
+            bundle_edges=bundle_edges,
+            incremental_layout=incremental_layout,
         )
 
     def update_edges(self, graph):
-        for (u, v), edge in graph.edges.items():
-            # Undirected graph has a Line edge
-            edge.put_start_and_end_on(graph[u].get_center(), graph[v].get_center())
+        graph.update_dirty_edges(self._rebuild_edge)
+
+    def _rebuild_edge(self, u: Hashable, v: Hashable, edge: Mobject):
+        # Undirected graph has a Line edge
+        edge.put_start_and_end_on(self[u].get_center(), self[v].get_center())
 
     def __repr__(self: Graph) -> str:
         return f"Undirected graph on {len(self.vertices)} vertices and {len(self.edges)} edges"
@@ -1398,6 +1803,8 @@ class DiGraph(GenericGraph):
             partitions: list[list[Hashable]] | None = None,
             root_vertex: Hashable | None = None,
             edge_config: dict | None = None,
+            bundle_edges: bool = False,
+            incremental_layout: bool = False,
     ) -> None:
         super().__init__(
             vertices,
@@ -1415,22 +1822,26 @@ class DiGraph(GenericGraph):
             root_vertex,
             edge_config,
             graph_type=GraphType.DIRECTED,
+            bundle_edges=bundle_edges,
+            incremental_layout=incremental_layout,
         )
 
     def update_edges(self, graph):
-        for (u, v), edge in graph.edges.items():
-            edge_type = type(edge)
-            tip = edge.pop_tips()
+        graph.update_dirty_edges(self._rebuild_edge)
 
-            new_edge = self.create_edge(edge_type, u, v).set_z_index(edge.z_index)
-            if isinstance(edge, Edge):
-                new_edge.fix_z_index()
+    def _rebuild_edge(self, u: Hashable, v: Hashable, edge: Mobject):
+        edge_type = type(edge)
+        tip = edge.pop_tips()
+
+        new_edge = self.create_edge(edge_type, u, v).set_z_index(edge.z_index)
+        if isinstance(edge, Edge):
+            new_edge.fix_z_index()
 
-            edge.become(new_edge)
-            if len(tip) > 0:
-                edge.add_tip(tip[0])
+        edge.become(new_edge)
+        if len(tip) > 0:
+            edge.add_tip(tip[0])
 
-            edge.set_color(edge.get_color())
+        edge.set_color(edge.get_color())
 
     def __repr__(self: DiGraph) -> str:
         return f"Directed graph on {len(self.vertices)} vertices and {len(self.edges)} edges"
@@ -1508,17 +1919,31 @@ class WeightedGraph(DiGraph):
 
         return edge_mobject
 
-    def update_edges(self, graph):
-        for (u, v), edge in graph.edges.items():
-            edge_type = type(edge)
-            tip = edge.pop_tips()
+    def _rebuild_edge(self, u: Hashable, v: Hashable, edge: Mobject):
+        edge_type = type(edge)
+        tip = edge.pop_tips()
+
+        new_edge = self.create_edge(edge_type, u, v)
+        if isinstance(edge, Edge) and new_edge.weight_mob is not None:
+            new_edge.weight_mob.match_height(edge.weight_mob)
+
+        edge.become(new_edge)
+        if len(tip) > 0:
+            edge.add_tip(tip[0])
+
+        edge.set_color(edge.get_color())
+
 
-            new_edge = self.create_edge(edge_type, u, v)
-            if isinstance(edge, Edge) and new_edge.weight_mob is not None:
-                new_edge.weight_mob.match_height(edge.weight_mob)
+def get_straight_edge_line(edge: Mobject) -> Line | None:
+    """The line of an edge that is a single straight segment, which put_edges_on_vertices can place in bulk"""
+    line = edge.edge_line if isinstance(edge, Edge) else edge
+    if type(line) is Line and len(line.points) == len(LINE_POINTS_ALPHAS):
+        return line
+    return None
 
-            edge.become(new_edge)
-            if len(tip) > 0:
-                edge.add_tip(tip[0])
 
-            edge.set_color(edge.get_color())
+def get_line_style(line: Line) -> tuple:
+    """Everything that has to match for lines to be drawn as one bundle"""
+    tip = line.tip if line.has_tip() else None
+    return (line.get_stroke_color().hex, line.get_stroke_width(), line.get_stroke_opacity(), line.z_index,
+            None if tip is None else (type(tip), round(tip.length, 6), round(tip.width, 6)))
@@ -1,24 +1,30 @@
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Hashable
+import itertools
+import time
+import weakref
+from typing import Hashable, Iterable
 
 import numpy as np
-from manim import MathTex, RIGHT, config, ORIGIN, VGroup, Line, Union, Intersection, ArcBetweenPoints
+from manim import MathTex, RIGHT, config, ORIGIN, VGroup, Line, ArcBetweenPoints, logger
 
 from manim.mobject.geometry.polygram import Polygon
 from scipy.spatial import Voronoi
 
 from tools.consts import DISTANCE_LABEL_COLOR, DISTANCE_LABEL_SCALE, DISTANCE_LABEL_BUFFER, EDGE_CONFIG, TIP_SIZE, \
     DEFAULT_ARROW_TIP_WIDTH, LABEL_COLOR, VERTEX_CONFIG, VERTEX_LABEL_SCALE, VERTEX_WIDTH
-from tools.funcs import get_convex_hull_polygon, get_tangent_points, boolean_op_to_polygons
+from tools.funcs import get_convex_hull_polygon, get_tangent_points
 from tools.graphs.my_graphs import DiGraph, WeightedGraph, Graph, Edge
 from tools.graphs.node import Node
+from tools.polygons import get_mobject_points, polygons_intersection, polygons_union
+
+SLOW_CREATE_GRAPH_SECONDS = 1
+# graph -> (what the cells depend on, vertex -> voronoi cell), see get_vertices_voronoi_cells
+_voronoi_cells_cache = weakref.WeakKeyDictionary()
 
 
 def get_neighbors(graph: DiGraph, vertex, priority_lst=None):
-    priority_lst = graph.vertices if priority_lst is None else priority_lst
-    return [neighbor for neighbor in priority_lst if (vertex, neighbor) in graph.edges]
+    return graph.get_neighbors(vertex, priority_lst)
 
 
 def create_dist_label(index: int, graph: DiGraph | WeightedGraph, label: str | int | float) -> MathTex:
@@ -35,43 +41,46 @@ def create_graph(vertices: list[Hashable], edges: list[tuple[Hashable, Hashable]
                  directed_graph: bool = False, graph_type=None, edge_type=Edge, vertex_type=Node,
                  rescale_vertices=True, labels: bool | dict[Hashable, str] = True,
                  weights: dict[tuple[Hashable, Hashable], float] = None,
-                 dual_arrow: bool = False) -> Graph | WeightedGraph | DiGraph:
+                 dual_arrow: bool = False, bundle_edges: bool = False) -> Graph | WeightedGraph | DiGraph:
     """
     Create graph and add labels to vertices,
     Note: vertices are 1-indexed
+    :param bundle_edges: Draw the plain edges as one merged mobject, see GenericGraph.
+    The construction time is kept in graph.construction_seconds (and printed when slow).
     """
-    edges = deepcopy(edges)
+    start = time.perf_counter()
+    edges = list(edges)
     if not directed_graph:
         edges += [(v, u) for u, v in edges]
+    edges_set = set(edges)
     if graph_type is None:
         graph_type = DiGraph if directed_graph else WeightedGraph if weights is not None else Graph
 
-    edge_config = deepcopy(EDGE_CONFIG)
+    # the graph copies the edge configs it gets, so the edges share a few of them
+    edge_config = EDGE_CONFIG
     if directed_graph:
+        tip_conf = EDGE_CONFIG.get("tip_config", {})
+        tip_size = tip_conf.get("tip_length", None)
+        tip_width = tip_conf.get("tip_width", None)
+        tip_edge_config = {**EDGE_CONFIG, "tip_config": {
+            **tip_conf, "tip_length": TIP_SIZE if tip_size is None or tip_size <= 0 else tip_size,
+            "tip_width": DEFAULT_ARROW_TIP_WIDTH if tip_width is None or tip_width <= 0 else tip_width}}
         edge_configs = {}
         for k, v in edges:
-            if (v, k) in edges and not dual_arrow:
-                edge_configs[(k, v)] = deepcopy(EDGE_CONFIG)
-            else:
-                edge_configs[(k, v)] = deepcopy(EDGE_CONFIG)
-                tip_conf = edge_configs[(k, v)].get("tip_config", {})
-
-                tip_size = tip_conf.get("tip_length", None)
-                tip_size = TIP_SIZE if tip_size is None or tip_size <= 0 else tip_size
-                edge_configs[(k, v)]["tip_config"]["tip_length"] = tip_size
-
-                tip_width = tip_conf.get("tip_width", None)
-                tip_width = DEFAULT_ARROW_TIP_WIDTH if tip_width is None or tip_width <= 0 else tip_width
-                edge_configs[(k, v)]["tip_config"]["tip_width"] = tip_width
-
-            if edge_configs[(k, v)].get("edge_type", None) == ArcBetweenPoints and (v, k) not in edges:
-                edge_configs[(k, v)]["angle"] = 0
-
+            edge_configs[(k, v)] = EDGE_CONFIG if (v, k) in edges_set and not dual_arrow else tip_edge_config
+            if edge_configs[(k, v)].get("edge_type", None) == ArcBetweenPoints and (v, k) not in edges_set:
+                edge_configs[(k, v)] = {**edge_configs[(k, v)], "angle": 0}
         edge_config = edge_configs
 
     args = dict(vertices=vertices, edges=edges, layout=layout, layout_scale=layout_scale, labels=labels,
                 label_fill_color=LABEL_COLOR, vertex_config=VERTEX_CONFIG.copy(), edge_config=edge_config,
-                edge_type=edge_type, vertex_type=vertex_type, root_vertex=1)
+                edge_type=edge_type, vertex_type=vertex_type, root_vertex=1, bundle_edges=bundle_edges)
+
+    from_template = vertex_type is Node and rescale_vertices and vertices and \
+                    (labels is True or isinstance(labels, dict) and all(vertex in labels for vertex in vertices))
+    if from_template:
+        args["vertex_mobjects"] = create_vertices_from_template(vertices, labels)
+        args["labels"] = {vertex: node.label for vertex, node in args["vertex_mobjects"].items()}
 
     if weights is not None:
         graph_type = WeightedGraph
@@ -80,11 +89,11 @@ def create_graph(vertices: list[Hashable], edges: list[tuple[Hashable, Hashable]
         args["weights"] = weights
 
     graph = graph_type(**args)
-    if rescale_vertices:
+    if rescale_vertices and not from_template:
         graph[list(graph.vertices.keys())[0]].scale_to_fit_width(VERTEX_WIDTH)
 
     for i, vertex in enumerate(graph.vertices):
-        if not labels:
+        if not labels or from_template:
             continue
         label = graph[vertex][1]
         graph[vertex].remove(label)
@@ -100,9 +109,35 @@ def create_graph(vertices: list[Hashable], edges: list[tuple[Hashable, Hashable]
 
     relative_scale = config.frame_width * 0.4 if graph.width > graph.height else config.frame_height * 0.7
     graph.scale_to_fit_width(relative_scale).move_to(ORIGIN).to_edge(RIGHT, buff=0.2)
+    graph.construction_seconds = time.perf_counter() - start
+    # slow constructions are worth seeing in the render log, the rest only when debugging
+    log = logger.info if graph.construction_seconds > SLOW_CREATE_GRAPH_SECONDS else logger.debug
+    log(f"create_graph: {len(graph.vertices)} vertices and {len(edges)} edges took {graph.construction_seconds:.2f}s")
     return graph
 
 
+def create_vertices_from_template(vertices: list[Hashable], labels: bool | dict[Hashable, str] = True) -> \
+        dict[Hashable, Node]:
+    """
+    Vertices sized as create_graph sizes them (VERTEX_WIDTH wide, labels at half the vertex height). Only the first
+    vertex is built and sized, every vertex is a copy of it with its own label.
+    """
+    texts = labels if isinstance(labels, dict) else {vertex: vertex for vertex in vertices}
+    template = Node(label=MathTex(texts[vertices[0]], fill_color=LABEL_COLOR), **VERTEX_CONFIG)
+    template.scale_to_fit_width(VERTEX_WIDTH)
+    template.remove(template.label)
+    vertex_mobjects = {}
+    for vertex in vertices:
+        node = template.copy()
+        label = MathTex(texts[vertex], fill_color=LABEL_COLOR)
+        label.scale_to_fit_height(node.height * 0.5).move_to(node).set_z_index(node.z_index + 1)
+        node.add(label)
+        # as the graph builds its nodes, keyed by their label
+        node.label = node.key = label
+        vertex_mobjects[vertex] = node
+    return vertex_mobjects
+
+
 def get_graph_convex_hull(graph: DiGraph | WeightedGraph, buff=None, round_radius=None, **kwargs) -> Polygon:
     points = np.array([vertex.get_center()[:2] for vertex in graph.vertices.values()])
     buff = buff if buff is not None else next(iter(graph.vertices.values())).get_width() * 2.8
@@ -111,20 +146,22 @@ def get_graph_convex_hull(graph: DiGraph | WeightedGraph, buff=None, round_radiu
 
 
 # ---------------------------- graph cut ----------------------------
+CUT_CELL_SCALE = 0.7
+CUT_BRIDGE_SCALE = 0.8
+CUT_BRIDGE_SHIFT = 0.2
+CUT_TRIANGLE_SCALE = 1.7
+CUT_ROUND_RADIUS = 0.3
+
+
 def get_vertices_cut(graph: DiGraph | WeightedGraph, vertices: list[Hashable], buff=None, scale=0.8,
                      round_radius=None, **kwargs) -> Polygon:
     buff = buff if buff is not None else next(iter(graph.vertices.values())).get_width() * 2
     round_radius = round_radius if round_radius is not None else next(iter(graph.vertices.values())).get_width() * 0.5
-    polygons = get_vertices_voronoi_polygons(graph, buff=buff, round_radius=0, **kwargs)
-    vertex_to_polygon = {vertex: polygon for vertex, polygon in zip(graph.vertices, polygons)}
+    vertex_to_polygon = get_vertices_voronoi_cells(graph, vertices, buff=buff, round_radius=0, **kwargs)
     if len(vertices) == 1:
         return vertex_to_polygon[vertices[0]].round_corners(round_radius).scale(scale)
     cut = VGroup(*[vertex_to_polygon[vertex] for vertex in vertices])
-    ret = VGroup()
     fix_scale_cut = VGroup()
-    scale_a = 0.8
-    scale = 0.7
-    shift_size = 0.2
     polygon_neghibors = set()
     edges_cut = {}
     for i, vertex_a in enumerate(vertices):
@@ -133,50 +170,164 @@ def get_vertices_cut(graph: DiGraph | WeightedGraph, vertices: list[Hashable], b
             if len(tangent_points) >= 2:
                 polygon_neghibors.add((vertex_a, vertex_b))
                 polygon_neghibors.add((vertex_b, vertex_a))
-                line_a = Line(tangent_points[0], tangent_points[1]).scale(scale_a).move_to(
-                    graph.vertices[vertex_b].get_center())
-                line_a.shift(-(line_a.get_center() - graph.vertices[vertex_a].get_center()) * shift_size)
-                line_b = Line(tangent_points[0], tangent_points[1]).scale(scale_a).move_to(
-                    graph.vertices[vertex_a].get_center())
-                line_b.shift(-(line_b.get_center() - graph.vertices[vertex_b].get_center()) * shift_size)
-                fix_scale_cut += Polygon(
-                    *[line_b.get_end(), line_a.get_end(), line_a.get_start(), line_b.get_start()][::-1],
-                    **kwargs).round_corners(0.1, components_per_rounded_corner=8)
-
+                fix_scale_cut += _get_cut_bridge(graph, vertex_a, vertex_b, tangent_points, **kwargs)
                 edges_cut[(vertex_a, vertex_b)] = fix_scale_cut[-1]
-                ret += Polygon(*[line_a.get_start(), line_a.get_end(), line_b.get_end(), line_b.get_start()],
-                               **kwargs)
-    trig = VGroup()
     for tri in find_all_triangular_in_vertives_set(polygon_neghibors, vertices):
-        vertex_poly_tri = [vertex_to_polygon[vertex] for vertex in tri]
-        cut += boolean_op_to_polygons(Union(*[vertex_to_polygon[vertex] for vertex in tri]), convex_hull=False,
-                                      **kwargs).surround(VGroup(*vertex_poly_tri), buff=0, stretch=True).scale(
-            scale * 1.7)
-        trig += cut[-1]
+        cut += _get_cut_triangle([vertex_to_polygon[vertex] for vertex in tri], **kwargs)
         remove_poly = [edges_cut[edge] for edge in edges_cut if edge[0] in tri and edge[1] in tri]
         fix_scale_cut.remove(*remove_poly)
-        cut.remove(*remove_poly)
-    cut = VGroup(*[polygon.scale(scale) for polygon in cut])
+    cut = VGroup(*[polygon.scale(CUT_CELL_SCALE) for polygon in cut])
     new_group = VGroup(*fix_scale_cut, *cut)
-    real_ret = boolean_op_to_polygons(Union(*new_group), convex_hull=False,
-                                      **kwargs).round_corners(0.3, components_per_rounded_corner=8)
+    real_ret = polygons_union(*new_group, **kwargs).round_corners(CUT_ROUND_RADIUS, components_per_rounded_corner=8)
     return real_ret
 
 
-def find_all_triangular_in_vertives_set(neighbors_edges, vertices: list[Hashable]) -> set[set[Hashable]]:
+def _get_cut_bridge(graph: DiGraph | WeightedGraph, vertex_a: Hashable, vertex_b: Hashable,
+                    tangent_points: list[np.ndarray], **kwargs) -> Polygon:
+    """The rounded quadrilateral joining the cells of two neighbor vertices of a cut across their common side"""
+    line_a = Line(tangent_points[0], tangent_points[1]).scale(CUT_BRIDGE_SCALE).move_to(
+        graph.vertices[vertex_b].get_center())
+    line_a.shift(-(line_a.get_center() - graph.vertices[vertex_a].get_center()) * CUT_BRIDGE_SHIFT)
+    line_b = Line(tangent_points[0], tangent_points[1]).scale(CUT_BRIDGE_SCALE).move_to(
+        graph.vertices[vertex_a].get_center())
+    line_b.shift(-(line_b.get_center() - graph.vertices[vertex_b].get_center()) * CUT_BRIDGE_SHIFT)
+    return Polygon(*[line_b.get_end(), line_a.get_end(), line_a.get_start(), line_b.get_start()][::-1],
+                   **kwargs).round_corners(0.1, components_per_rounded_corner=8)
+
+
+def _get_cut_triangle(cells: list[Polygon], **kwargs) -> Polygon:
+    """Fills the gap between the cells of three pairwise neighbor vertices of a cut (unscaled, like the cells)"""
+    return polygons_union(*cells, **kwargs).surround(
+        VGroup(*cells), buff=0, stretch=True).scale(CUT_CELL_SCALE * CUT_TRIANGLE_SCALE)
+
+
+class IncrementalCuts:
+    """
+    Cuts of a graph as get_vertices_cut draws them, built by merging. Every cut keeps its unrounded shape, and the
+    union of two cuts is the union of their shapes with the bridges and triangles between them only. A merge costs
+    the boundary of the two cuts instead of a rebuild from all their vertices. The shapes are dropped when the
+    vertices move (see get_vertices_voronoi_cells).
+    """
+
+    def __init__(self, graph: DiGraph | WeightedGraph, buff=None, scale=0.8, round_radius=None, **kwargs):
+        self.graph = graph
+        self.buff, self.scale, self.round_radius = buff, scale, round_radius
+        self.kwargs = kwargs
+        self.cells = {}
+        self.neighbors = {}  # vertex -> (vertex -> tangent points) of the vertices whose cells share a side with it
+        self.shapes = {}  # frozenset of vertices -> unrounded cut shape
+        self.vertices_key = None
+
+    def get_cut(self, vertices: list[Hashable]) -> Polygon:
+        """The cut of vertices, grown from the longest prefix of vertices that is already a cut (if any)"""
+        self.update_cells()
+        if len(vertices) == 1:
+            round_radius = self.round_radius if self.round_radius is not None else \
+                next(iter(self.graph.vertices.values())).get_width() * 0.5
+            return self.cells[vertices[0]].copy().round_corners(round_radius).scale(self.scale)
+        prefix = next(i for i in range(len(vertices), 0, -1) if i == 1 or frozenset(vertices[:i]) in self.shapes)
+        cut_vertices = frozenset(vertices[:prefix])
+        for vertex in vertices[prefix:]:
+            cut_vertices = self.merge(cut_vertices, frozenset([vertex]))
+        return self.get_rounded_shape(cut_vertices)
+
+    def union(self, vertices_a: Iterable[Hashable], vertices_b: Iterable[Hashable]) -> Polygon:
+        """The cut of the union of two cuts, from their shapes"""
+        self.update_cells()
+        vertices_a, vertices_b = frozenset(vertices_a), frozenset(vertices_b)
+        for cut_vertices in (vertices_a, vertices_b):
+            if cut_vertices not in self.shapes and len(cut_vertices) > 1:
+                self.get_cut(list(cut_vertices))
+        return self.get_rounded_shape(self.merge(vertices_a, vertices_b))
+
+    def merge(self, vertices_a: frozenset, vertices_b: frozenset) -> frozenset:
+        merged = vertices_a | vertices_b
+        if merged in self.shapes:
+            return merged
+        cross_pairs = [(a, b) for a in vertices_a for b in self.neighbors[a] if b in vertices_b]
+        # the triangles with a side across the two cuts are exactly the new ones
+        triangles = {frozenset((a, b, c)) for a, b in cross_pairs for c in self.neighbors[a] if
+                     c in self.neighbors[b] and c in merged}
+        # as in get_vertices_cut, a triangle replaces the bridges of its sides
+        in_triangles = {pair for triangle in triangles for pair in itertools.combinations(triangle, 2)}
+        parts = [self.get_shape(vertices_a), self.get_shape(vertices_b)]
+        parts += [_get_cut_bridge(self.graph, a, b, self.neighbors[a][b], **self.kwargs) for a, b in cross_pairs if
+                  (a, b) not in in_triangles and (b, a) not in in_triangles]
+        parts += [_get_cut_triangle([self.cells[vertex] for vertex in triangle], **self.kwargs).scale(
+            CUT_CELL_SCALE) for triangle in triangles]
+        self.shapes[merged] = polygons_union(*parts, **self.kwargs)
+        return merged
+
+    def get_shape(self, vertices: frozenset) -> Polygon:
+        if len(vertices) == 1:
+            return self.cells[next(iter(vertices))].copy().scale(CUT_CELL_SCALE)
+        return self.shapes[vertices]
+
+    def get_rounded_shape(self, vertices: frozenset) -> Polygon:
+        return self.shapes[vertices].copy().round_corners(CUT_ROUND_RADIUS, components_per_rounded_corner=8)
+
+    def update_cells(self):
+        """Recompute the cells and their neighbors, and drop the cut shapes, if the vertices moved"""
+        vertices_key = get_vertices_key(self.graph)
+        if vertices_key == self.vertices_key:
+            return
+        buff = self.buff if self.buff is not None else next(iter(self.graph.vertices.values())).get_width() * 2
+        self.cells = get_vertices_voronoi_cells(self.graph, buff=buff, round_radius=0, **self.kwargs)
+        self.neighbors = {vertex: {} for vertex in self.cells}
+        vertices = list(self.cells)
+        for i, vertex_a in enumerate(vertices):
+            for vertex_b in vertices[i + 1:]:
+                tangent_points = get_tangent_points(self.cells[vertex_a], self.cells[vertex_b])
+                if len(tangent_points) >= 2:
+                    self.neighbors[vertex_a][vertex_b] = self.neighbors[vertex_b][vertex_a] = tangent_points
+        self.shapes = {}
+        self.vertices_key = vertices_key
+
+
+def find_all_triangular_in_vertives_set(neighbors_edges, vertices: list[Hashable]) -> set[tuple[Hashable, ...]]:
+    """
+    The triangles of the (undirected) neighbors_edges among vertices, each once and ordered as in vertices.
+    Every vertex is only paired with its later neighbors, O(sum of deg^2).
+    """
+    rank = {vertex: i for i, vertex in enumerate(vertices)}
+    later_neighbors = {vertex: set() for vertex in vertices}
+    for u, v in neighbors_edges:
+        if u in rank and v in rank and u != v:
+            first, second = (u, v) if rank[u] < rank[v] else (v, u)
+            later_neighbors[first].add(second)
     ret = set()
-    for i, vertex_a in enumerate(vertices):
-        for j, vertex_b in enumerate(vertices[i + 1:]):
-            for vertex_c in vertices[j + 1:]:
-                if (vertex_a, vertex_b) in neighbors_edges and (vertex_b, vertex_c) in neighbors_edges and (vertex_c,
-                                                                                                            vertex_a) in neighbors_edges:
-                    ret.add((vertex_a, vertex_b, vertex_c))
+    for vertex_a in vertices:
+        for vertex_b in later_neighbors[vertex_a]:
+            for vertex_c in later_neighbors[vertex_a] & later_neighbors[vertex_b]:
+                ret.add((vertex_a, vertex_b, vertex_c))
     return ret
 
 
+def get_vertices_key(graph: DiGraph | WeightedGraph) -> tuple:
+    """Changes whenever a vertex is added, removed, moved or resized"""
+    return tuple(graph.vertices), np.array([[*vertex.get_center(), vertex.width, vertex.height] for vertex in
+                                            graph.vertices.values()]).tobytes()
+
+
+def get_vertices_voronoi_cells(graph: DiGraph | WeightedGraph, vertices: list[Hashable] = None,
+                               round_radius: float = None, buff=None, **kwargs) -> dict[Hashable, Polygon]:
+    """
+    Copies of the voronoi cells (see get_vertices_voronoi_polygons) of vertices (default all). The cells of a graph
+    are computed once and recomputed only when its vertices move or resize, or the arguments change.
+    """
+    key = (get_vertices_key(graph), round_radius, buff, repr(sorted(kwargs.items())))
+    cached_key, cells = _voronoi_cells_cache.get(graph, (None, None))
+    if cached_key != key:
+        polygons = get_vertices_voronoi_polygons(graph, round_radius=round_radius, buff=buff, **kwargs)
+        cells = {vertex: polygon for vertex, polygon in zip(graph.vertices, polygons)}
+        _voronoi_cells_cache[graph] = (key, cells)
+    vertices = graph.vertices if vertices is None else vertices
+    return {vertex: cells[vertex].copy() for vertex in vertices}
+
+
 def get_vertices_voronoi_polygons(graph: DiGraph | WeightedGraph, round_radius: float = None, buff=None, **kwargs) -> \
         VGroup[Polygon]:
-    graph_hull = get_graph_convex_hull(graph, buff=buff, **kwargs)
+    graph_hull = get_mobject_points(get_graph_convex_hull(graph, buff=buff, **kwargs))
     surround_hull = get_graph_convex_hull(graph).scale(10)
     vor = Voronoi(np.concatenate((np.array([vertex.get_center()[:2] for vertex in graph.vertices.values()]),
                                   surround_hull.get_vertices()[:, :2])))
@@ -185,7 +336,6 @@ def get_vertices_voronoi_polygons(graph: DiGraph | WeightedGraph, round_radius:
     for r in range(len(vor.point_region)):
         region = vor.regions[vor.point_region[r]]
         if not -1 in region:
-            polygon = Polygon(*[np.append(vor.vertices[i], 0) for i in region], **kwargs)
-            intersec_shape = Intersection(polygon, graph_hull)
-            polygons.append(boolean_op_to_polygons(intersec_shape, **kwargs).round_corners(radius=round_radius))
+            cell = polygons_intersection(vor.vertices[region], graph_hull, convex_hull=True, **kwargs)
+            polygons.append(cell.round_corners(radius=round_radius))
     return VGroup(*polygons)
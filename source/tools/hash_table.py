@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from manim import *
 from tools.array import ArrayEntry
+from tools.polygons import polygons_difference
 
 DEFAULT_HASH_ARROWS_COLOR: ManimColor = YELLOW
+ROUND_FRAME_SAMPLES_PER_CURVE = 8  # keeps the rounded corners round through the polygon difference
 
 
 class HashTable(VGroup):
@@ -43,7 +45,9 @@ class HashTable(VGroup):
         top_round_rect = top_orig_frame.copy().stretch_to_fit_height(top_orig_frame.get_height() * 1.5).round_corners(
             round_radius).next_to(top_orig_frame.get_top(), DOWN, buff=0)
         top_orig_frame.next_to(self.keys[1].frame.get_top(), DOWN, buff=0)
-        custom_rect = Difference(top_round_rect, top_orig_frame)
+        custom_rect = polygons_difference(top_round_rect, top_orig_frame,
+                                          samples_per_curve=ROUND_FRAME_SAMPLES_PER_CURVE)
+        custom_rect.match_style(top_orig_frame)
         top_orig_frame.become(custom_rect)
 
         bottom_orig_frame = self.keys[-1].frame
@@ -51,7 +55,9 @@ class HashTable(VGroup):
             bottom_orig_frame.get_height() * 1.5).round_corners(
             round_radius).next_to(bottom_orig_frame.get_bottom(), UP, buff=0)
         bottom_orig_frame.next_to(self.keys[-2].frame.get_bottom(), UP, buff=0)
-        custom_rect = Difference(bottom_round_rect, bottom_orig_frame)
+        custom_rect = polygons_difference(bottom_round_rect, bottom_orig_frame,
+                                          samples_per_curve=ROUND_FRAME_SAMPLES_PER_CURVE)
+        custom_rect.match_style(bottom_orig_frame)
         bottom_orig_frame.become(custom_rect)
 
     def rehash(self, hash_func: Callable[[int], int]):
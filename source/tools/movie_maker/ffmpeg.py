@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+from manim import config
+
+
+def run_ffmpeg(args: list[str]):
+    subprocess.run([config.ffmpeg_executable, "-y", "-nostdin", "-loglevel", "error"] + args, check=True)
+
+
+def get_ffmpeg_concat_path(path: Path) -> str:
+    """Absolute path quoted for an ffmpeg concat list"""
+    return Path(path).absolute().as_posix().replace("'", "'\\''")
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import manim
+from manim import Scene
+
+import tools.consts
+
+SOURCE_PATH = Path(__file__).resolve().parents[2]
+FINGERPRINTS_MANIFEST_NAME = "fingerprints.json"
+# modules that only drive the rendering and never change the frames of a scene
+IGNORED_MODULES = ("tools.movie_maker",)
+
+
+def scene_fingerprint(scene: type[Scene], render_settings: dict) -> str:
+    """
+    Hash everything that affects the frames of a scene: the source of the scene classes (its own class and project
+    base classes, without the sibling scenes of the same modules), the project modules it transitively imports, the
+    values of tools.consts and the render settings (quality etc.).
+    """
+    digest = hashlib.sha256()
+    for module in sorted(get_project_modules(scene), key=get_module_key):
+        digest.update(get_module_key(module).encode())
+        digest.update(get_module_source(module, scene).encode())
+    digest.update(get_consts_repr().encode())
+    digest.update(json.dumps({**render_settings, "manim": manim.__version__}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def get_module_key(module: ModuleType) -> str:
+    """Path relative to the source dir, so running a scene file as __main__ yields the same fingerprint"""
+    return Path(module.__file__).resolve().relative_to(SOURCE_PATH).as_posix()
+
+
+def is_project_module(module: ModuleType) -> bool:
+    module_file = getattr(module, "__file__", None)
+    if module_file is None or module.__name__.startswith(IGNORED_MODULES):
+        return False
+    return SOURCE_PATH in Path(module_file).resolve().parents
+
+
+def get_project_modules(scene: type[Scene]) -> set[ModuleType]:
+    """The modules defining the scene and its bases, together with all project modules they import"""
+    modules = {sys.modules[cls.__module__] for cls in scene.__mro__ if cls.__module__ in sys.modules}
+    to_visit = [module for module in modules if is_project_module(module)]
+    visited = set()
+    while to_visit:
+        module = to_visit.pop()
+        if module in visited:
+            continue
+        visited.add(module)
+        to_visit += [imported for imported in get_imported_modules(module) if imported not in visited]
+    return visited
+
+
+def get_imported_modules(module: ModuleType) -> list[ModuleType]:
+    tree = ast.parse(Path(module.__file__).read_text(encoding="utf-8"))
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                base = importlib.util.resolve_name("." * node.level + (node.module or ""), module.__package__)
+            except (ImportError, ValueError):
+                continue
+            # "from package import module" imports a module as well
+            names += [base] + [f"{base}.{alias.name}" for alias in node.names]
+    return [sys.modules[name] for name in names if name in sys.modules and is_project_module(sys.modules[name])]
+
+
+def get_module_source(module: ModuleType, scene: type[Scene]) -> str:
+    """
+    Module source without the other scenes defined in it (so editing one scene doesn't invalidate its neighbours)
+    and without the ``if __name__ == "__main__"`` block.
+    """
+    source = Path(module.__file__).read_text(encoding="utf-8")
+    segments = []
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef):
+            cls = getattr(module, node.name, None)
+            if inspect.isclass(cls) and issubclass(cls, Scene) and cls not in scene.__mro__:
+                continue
+        if isinstance(node, ast.If) and "__name__" in ast.unparse(node.test):
+            continue
+        segments.append(ast.get_source_segment(source, node))
+    return "\n".join(segments)
+
+
+def get_consts_repr() -> str:
+    """Values (after any runtime changes made by the scenes modules) of the names assigned in tools.consts"""
+    tree = ast.parse(Path(tools.consts.__file__).read_text(encoding="utf-8"))
+    names = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names.add(node.target.id)
+    return "\n".join(f"{name}={get_const_repr(getattr(tools.consts, name))}" for name in sorted(names))
+
+
+def get_const_repr(value) -> str:
+    """Paths relative to the checkout (and other paths left out), so another clone or CI gets the same fingerprint"""
+    if not isinstance(value, Path):
+        return repr(value)
+    try:
+        return Path(value).resolve().relative_to(tools.consts.DASTIMATOR_PATH).as_posix()
+    except ValueError:
+        return "<path>"
+
+
+def load_manifest(manifest_path: Path) -> dict[str, str]:
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest_path: Path, manifest: dict[str, str]):
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
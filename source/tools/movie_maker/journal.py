@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+JOURNAL_NAME = "{movie_name}_journal.json"
+
+
+class RenderJournal:
+    """
+    Persistent record of the finished steps of a render_scenes run (rendered scenes, gifs and the post-processing
+    steps), so a crashed run can be resumed. Every finished step is stored with the files it produced, and a step
+    only counts as done while all of these files still exist.
+    """
+
+    def __init__(self, journal_path: Path | str, run_info: dict, resume: bool = False):
+        self.journal_path = Path(journal_path)
+        self.run_info = run_info
+        self.steps: dict[str, list[str]] = {}
+        if resume and self.journal_path.exists():
+            with open(self.journal_path, "r") as f:
+                journal = json.load(f)
+            if journal.get("run_info") == run_info:
+                self.steps = journal.get("steps", {})
+            else:
+                print(f"Journal '{self.journal_path.name}' belongs to a different run, starting from scratch")
+        self.save()
+
+    def is_done(self, step: str) -> bool:
+        if step not in self.steps:
+            return False
+        missing = [output for output in self.steps[step] if not Path(output).exists()]
+        if missing:
+            print(f"Step '{step}' is journaled as done but its outputs are missing: {missing}")
+            return False
+        print(f"Skipping '{step}', already done")
+        return True
+
+    def mark_done(self, step: str, outputs: list[Path | str] = ()):
+        self.steps[step] = [str(output) for output in outputs]
+        self.save()
+
+    def invalidate(self, *steps: str):
+        for step in steps:
+            self.steps.pop(step, None)
+        self.save()
+
+    def save(self):
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.journal_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"run_info": self.run_info, "steps": self.steps}, f, indent=4)
+        # never leave a half written journal behind when crashing mid-save
+        os.replace(tmp_path, self.journal_path)
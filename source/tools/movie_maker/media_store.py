@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+from tools.consts import MOVIES_PATH
+
+MEDIA_STORE_DIR_NAME = "store"
+PROJECT_FILE_NAME = "project.json"
+# renditions of the sections (see renditions.py), one dir per source clip hash
+RENDITIONS_DIR_NAME = "renditions"
+RENDITIONS_MANIFEST_NAME = "renditions.json"
+# files written by the manim editor export, anything else in a media dir (pdfs etc.) belongs to the user
+EXPORTED_MEDIA_PATTERN = re.compile(r"(video|thumb)_\d+\.(mp4|jpg)")
+THUMBNAIL_PATTERN = re.compile(r"thumb_(\d+)\.jpg")
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def get_store_path(movies_path: Path = MOVIES_PATH) -> Path:
+    return Path(movies_path) / MEDIA_STORE_DIR_NAME
+
+
+def get_file_hash(file: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_file(file: Path, store_path: Path) -> tuple[Path, bool]:
+    """
+    Move a file into the store under the hash of its content. A blob that is already stored is never rewritten.
+    Returns the blob and whether it is new.
+    """
+    store_path.mkdir(parents=True, exist_ok=True)
+    blob = store_path / f"{get_file_hash(file)}{file.suffix}"
+    if blob.exists():
+        file.unlink()
+        return blob, False
+    os.replace(file, blob)
+    return blob, True
+
+
+def store_exported_sections(slides: list, movie_dir: Path, out_media_dir: Path, store_path: Path = None) -> int:
+    """
+    Move the videos and thumbnails the manim editor exported to out_media_dir into the content addressed store, and
+    point the sections at their blobs (relative to movie_dir, so project.json and index.html reference the store).
+    Like reorder_manedit_dirs_structure, the thumbnail of a slide (of its last section) is the one exported for the
+    section before it. Leftovers of previous exports are removed from out_media_dir. Returns the number of new blobs.
+    """
+    store_path = get_store_path(movie_dir.parent) if store_path is None else store_path
+    new_blobs, blobs = 0, {}
+    for slide in slides:
+        for section in slide.sections:
+            for attr in ("in_project_video", "in_project_thumbnail"):
+                name = Path(getattr(section, attr)).name
+                blob, is_new = store_file(out_media_dir / name, store_path)
+                new_blobs += is_new
+                blobs[name] = Path(os.path.relpath(blob, movie_dir)).as_posix()
+    for slide in slides:
+        for section in slide.sections:
+            for attr in ("in_project_video", "in_project_thumbnail"):
+                setattr(section, attr, blobs[Path(getattr(section, attr)).name])
+        thumbnail = THUMBNAIL_PATTERN.fullmatch(Path(slide.sections[-1].in_project_thumbnail).name)
+        previous_thumbnail = None if thumbnail is None else f"thumb_{str(int(thumbnail[1]) - 1).zfill(4)}.jpg"
+        if previous_thumbnail in blobs:
+            slide.sections[-1].in_project_thumbnail = blobs[previous_thumbnail]
+    for file in out_media_dir.iterdir():
+        if EXPORTED_MEDIA_PATTERN.fullmatch(file.name):
+            file.unlink()
+    print(f"Stored {new_blobs} new media files in '{store_path}'")
+    return new_blobs
+
+
+def get_referenced_blobs(movies_path: Path = MOVIES_PATH) -> set[Path]:
+    """
+    Blobs referenced by the project.json of any movie in movies_path, and the renditions dirs referenced by their
+    renditions.json
+    """
+    referenced = set()
+    for project_file in Path(movies_path).glob(f"*/{PROJECT_FILE_NAME}"):
+        with open(project_file, "r", encoding="utf-8") as f:
+            slides = json.load(f)
+        for slide in slides:
+            for section in slide["sections"]:
+                for attr in ("in_project_video", "in_project_thumbnail"):
+                    referenced.add((project_file.parent / section[attr]).resolve())
+    for manifest_file in Path(movies_path).glob(f"*/{RENDITIONS_MANIFEST_NAME}"):
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        for section in manifest["sections"]:
+            referenced.add((manifest_file.parent / section["master_playlist"]).parent.resolve())
+    return referenced
+
+
+def get_stored_size(path: Path) -> int:
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file()) if path.is_dir() \
+        else path.stat().st_size
+
+
+def collect_garbage(movies_path: Path = MOVIES_PATH, dry_run: bool = False) -> list[Path]:
+    """Delete the blobs and renditions no movie references anymore. Returns the (would be) deleted paths."""
+    store_path = get_store_path(movies_path)
+    if not store_path.exists():
+        return []
+    referenced = get_referenced_blobs(movies_path)
+    renditions_path = store_path / RENDITIONS_DIR_NAME
+    stored = [blob for blob in store_path.iterdir() if blob.is_file()]
+    if renditions_path.exists():
+        stored += list(renditions_path.iterdir())
+    unreferenced = [blob for blob in stored if blob.resolve() not in referenced]
+    freed = sum(get_stored_size(blob) for blob in unreferenced)
+    if not dry_run:
+        for blob in unreferenced:
+            if blob.is_dir():
+                shutil.rmtree(blob)
+            else:
+                blob.unlink()
+    action = "Would delete" if dry_run else "Deleted"
+    print(f"{action} {len(unreferenced)} unreferenced blobs ({freed / 2 ** 20:.1f}MB)")
+    return unreferenced
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the content addressed media store of the exported movies")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    gc_parser = subparsers.add_parser("gc", help="delete the blobs and renditions that no movie references")
+    gc_parser.add_argument("--movies-path", type=Path, default=MOVIES_PATH)
+    gc_parser.add_argument("--dry-run", action="store_true", help="only list what would be deleted")
+    args = parser.parse_args()
+    if args.command == "gc":
+        collect_garbage(args.movies_path, args.dry_run)
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 import shutil
+import tempfile
+import time
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from manim import QUALITIES, Scene, tempconfig
-from moviepy.video.compositing.concatenate import concatenate_videoclips
-from moviepy.editor import VideoFileClip
 
 from tools.scenes import SectionsScene
+from tools.profiling import PROFILES_DIR_NAME
+from tools.movie_maker.fingerprint import FINGERPRINTS_MANIFEST_NAME, scene_fingerprint, load_manifest, save_manifest
+from tools.movie_maker.journal import JOURNAL_NAME, RenderJournal
+from tools.movie_maker.planner import plan_scenes, update_calibration
+from tools.movie_maker.media_store import store_exported_sections
+from tools.movie_maker.ffmpeg import get_ffmpeg_concat_path, run_ffmpeg
+from tools.movie_maker.renditions import export_renditions
+from tools.movie_maker.prefetch import DEFAULT_PREFETCH_SECTIONS, get_prefetch_manifest, save_prefetch_manifest
 from tools.consts import MOVIES_PATH
 from typing import List
 
@@ -26,13 +36,28 @@ SCENE_CLIP_NAME = "{scene_name}_{section_num:04d}.mp4"
 MANIM_EDITOR_COMMAND = "manedit"
 MOVIE_MEDIA_DIR_NAME = "media"
 DEFAULT_GIF_RESIZE = 0.2
+DEFAULT_GIF_FPS = 13
+# output options per animated preview format, gif gets a generated palette on top
+GIF_FORMATS_OPTIONS = {"gif": ["-f", "gif", "-loop", "0"],
+                       "webp": ["-f", "webp", "-c:v", "libwebp", "-lossless", "0", "-q:v", "70", "-loop", "0"],
+                       "apng": ["-f", "apng", "-plays", "0"]}
+GIF_PALETTE_USE = "paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle"
+PARALLEL_MEDIA_DIR_NAME = "parallel"
+RENDER_STEP = "render:{scene_name}"
+GIF_STEP = "gif:{scene_name}"
+AUTOCREATED_FIX_STEP = "autocreated_fix"
+MANIM_EDITOR_STEP = "manim_editor_export"
+REORDER_DIRS_STEP = "reorder_dirs"
 CUR_DIR = Path(__file__).parent.absolute()
 
 
 def render_scenes(scenes_lst: list, media_path, presentation_mode: bool = False, disable_caching: bool = False,
                   preview: bool = True, save_sections: bool = True, quality: str = None, overwrite_scenes: bool = True,
                   scenes_to_gif_frames: dict[Scene, list[int]] = None, run_manedit: bool = None, movie_name: str = "",
-                  description_title: str = "", description: str = "", **kwargs):
+                  description_title: str = "", description: str = "", parallel: bool = False,
+                  max_workers: int = None, incremental: bool = False, section_cache: bool = False,
+                  resume: bool = False, dry_run: bool = False, profile: bool = False,
+                  gif_format: str = "gif", renditions: tuple[int] = None, media_store: bool = False, **kwargs):
     """Run a list of scenes. This function is used by the manim command line interface.
     Possible quality settings are:
     - fourk_quality [k] 2160X3840
@@ -40,6 +65,28 @@ def render_scenes(scenes_lst: list, media_path, presentation_mode: bool = False,
     - high_quality [h] 1080X1920
     - medium_quality [m] 720X1280
     - low_quality [l] 480X854
+    :param parallel: Render the scenes in a process pool. Each scene is rendered into its own media dir and the results
+     are merged back in the order of scenes_lst.
+    :param max_workers: Number of worker processes in parallel mode (defaults to the number of cpus).
+    :param incremental: Re-render only scenes whose fingerprint (source, used tools modules, consts and quality)
+     changed since the last render. Fingerprints are kept in a manifest next to the sections dir. Overrides
+     overwrite_scenes.
+    :param section_cache: Cache the clip of every section and, when a scene is re-rendered, encode only the sections
+     from the first changed one onward (see SectionsScene.cache_section).
+    :param resume: Continue a crashed run: skip the scenes and post-processing steps that the run journal (kept in
+     media_path) records as finished, as long as their outputs still exist.
+    :param dry_run: Render nothing. Construct every scene with skipped animations and print (and return) a plan with
+     the number of plays, animation seconds, sections, frames and Tex compilations, and the estimated render time,
+     based on the speed of the last fully rendered scenes (at any quality), split between the workers when parallel.
+    :param profile: Time every play and section of the rendered scenes (updaters, rasterization, encoding, Tex,
+     mobject counts and peak memory) and save a json, csv and sortable html report per scene in media_path/profiles.
+    :param gif_format: Format of the scenes_to_gif_frames previews: gif, webp or apng.
+    :param renditions: Heights (e.g. (480, 720, 1440)) to export every section at as HLS renditions next to the
+     rendered quality. The presentation page then picks the rendition that fits the connection (see export_movie).
+    :param media_store: Keep the exported videos and thumbnails in the content addressed store shared by all movies
+     (see media_store.py). The media dir of the movie is then left empty and isn't reordered, so tooling that reads
+     the media dir of a movie has to read its project.json instead. Off by default: existing decks keep their layout
+     until they are exported again with it.
     """
     if quality is None:
         quality = "production_quality" if presentation_mode else "low_quality"
@@ -56,57 +103,191 @@ def render_scenes(scenes_lst: list, media_path, presentation_mode: bool = False,
     if not Path(media_path).exists():
         Path(media_path).mkdir(parents=True, exist_ok=True)
     jsons_path = media_path / SECTIONS_MEDIA_PATH.format(quality_dir=QUALITY_TO_DIR[quality])
+    if dry_run:
+        workers = min(max_workers or os.cpu_count() or 1, len(scenes_lst)) if parallel else 1
+        return plan_scenes(scenes_lst, quality, media_path, presentation_mode, workers)
+
+    scene_config = {"quality": quality, "preview": preview, "media_dir": media_path, "save_sections": save_sections,
+                    "disable_caching": disable_caching}
+    manifest_path = jsons_path.with_name(FINGERPRINTS_MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    fingerprints = {}
+    if incremental:
+        render_settings = {"quality": quality, "presentation_mode": presentation_mode, "save_sections": save_sections}
+        fingerprints = {scene.__name__: scene_fingerprint(scene, render_settings) for scene in scenes_lst}
+        scenes_to_render = [scene for scene in scenes_lst if
+                            manifest.get(scene.__name__) != fingerprints[scene.__name__] or
+                            not jsons_path.with_name(scene.__name__ + ".mp4").exists()]
+        print(f"Scenes up to date: {[scene.__name__ for scene in scenes_lst if scene not in scenes_to_render]}")
+    else:
+        scenes_to_render = [scene for scene in scenes_lst if
+                            overwrite_scenes or not jsons_path.with_name(scene.__name__ + ".mp4").exists()]
+
+    journal = RenderJournal(media_path / JOURNAL_NAME.format(movie_name=movie_name or "render"),
+                            {"scenes": [scene.__name__ for scene in scenes_lst], "quality": quality,
+                             "presentation_mode": presentation_mode}, resume=resume)
+    scene_outputs = lambda scene: [(jsons_path / scene.__name__).with_suffix(".json"),
+                                   jsons_path.with_name(scene.__name__ + ".mp4")]
+    scenes_to_render = [scene for scene in scenes_to_render if
+                        not journal.is_done(RENDER_STEP.format(scene_name=scene.__name__))]
+
+    scene_attrs = {"PRESENTATION_MODE": presentation_mode, "SECTION_CACHE": section_cache, "PROFILE": profile}
+    render_stats = []
+
+    def on_scene_rendered(scene, stats: dict):
+        render_stats.append(stats)
+        update_calibration(media_path, quality, render_stats)
+        if incremental:
+            manifest[scene.__name__] = fingerprints[scene.__name__]
+            save_manifest(manifest_path, manifest)
+        # everything made out of the scene has to be redone
+        journal.invalidate(GIF_STEP.format(scene_name=scene.__name__), AUTOCREATED_FIX_STEP, MANIM_EDITOR_STEP,
+                           REORDER_DIRS_STEP)
+        journal.mark_done(RENDER_STEP.format(scene_name=scene.__name__), scene_outputs(scene) if save_sections else [])
+
+    if parallel:
+        render_scenes_parallel(scenes_to_render, scene_config, scene_attrs, jsons_path, max_workers, on_scene_rendered)
+    else:
+        for scene in scenes_to_render:
+            on_scene_rendered(scene, render_scene(scene, scene_config, scene_attrs))
 
     for scene in scenes_lst:
-        if not overwrite_scenes and jsons_path.with_name(scene.__name__ + ".mp4").exists():
-            continue
-
-        with tempconfig(
-                {"quality": quality, "preview": preview, "media_dir": media_path, "save_sections": save_sections,
-                 "disable_caching": disable_caching}):
-            scene_obj = scene()
-            if isinstance(scene_obj, SectionsScene):
-                scene_obj.PRESENTATION_MODE = presentation_mode
-            scene_obj.render()
-        if scene in scenes_to_gif_frames:
-            create_scene_gif(MOVIES_PATH / movie_name, scene.__name__, scenes_to_gif_frames[scene],
-                             QUALITY_TO_DIR[quality], media_path, gif_name=movie_name)
-
-    if save_sections:
+        gif_step = GIF_STEP.format(scene_name=scene.__name__)
+        # a resumed run may still owe the gif of a scene rendered before the crash
+        if scene in scenes_to_gif_frames and (scene in scenes_to_render or resume) and not journal.is_done(gif_step):
+            gif_path = create_scene_gif(MOVIES_PATH / movie_name, scene.__name__, scenes_to_gif_frames[scene],
+                                        QUALITY_TO_DIR[quality], media_path, gif_name=movie_name,
+                                        gif_format=gif_format)
+            journal.mark_done(gif_step, [gif_path])
+
+    if save_sections and not journal.is_done(AUTOCREATED_FIX_STEP):
         manim_editor_autocreated_scene_fix(jsons_path)
+        journal.mark_done(AUTOCREATED_FIX_STEP, [path for scene in scenes_lst for path in scene_outputs(scene)])
 
     if run_manedit:
         if movie_name == "":
             raise ValueError("movie_name must be specified when run_manedit is True")
-        run_manim_editor(scenes_lst, jsons_path, movie_name, description_title, description)
-        reorder_manedit_dirs_structure(MOVIES_PATH / movie_name)
+        movie_dir = MOVIES_PATH / movie_name
+        if not journal.is_done(MANIM_EDITOR_STEP):
+            run_manim_editor(scenes_lst, jsons_path, movie_name, description_title, description, media_store,
+                             renditions)
+            journal.mark_done(MANIM_EDITOR_STEP, [movie_dir / "index.html", movie_dir / "project.json"])
+        # the store already points the slides at their blobs and thumbnails
+        if not media_store and not journal.is_done(REORDER_DIRS_STEP):
+            reorder_manedit_dirs_structure(movie_dir)
+            journal.mark_done(REORDER_DIRS_STEP, [movie_dir / "index.html", movie_dir / MOVIE_MEDIA_DIR_NAME])
+
+
+def render_scene(scene: type[Scene], scene_config: dict, scene_attrs: dict = None) -> dict:
+    """
+    Render a single scene under its own tempconfig. Must stay picklable for the parallel workers.
+    :param scene_attrs: SectionsScene class attributes to set on the scene (PRESENTATION_MODE, SECTION_CACHE, ...).
+    Returns the render stats (wall seconds, animation seconds and sections reused from the section cache) used for
+    calibrating dry runs.
+    """
+    start = time.perf_counter()
+    with tempconfig(scene_config):
+        scene_obj = scene()
+        if isinstance(scene_obj, SectionsScene):
+            for attr, value in (scene_attrs or {}).items():
+                setattr(scene_obj, attr, value)
+        scene_obj.render()
+    cached_sections = sum(reused for _, reused in getattr(scene_obj, "sections_cache_keys", {}).values())
+    return {"scene": scene.__name__, "seconds": time.perf_counter() - start,
+            "animation_seconds": scene_obj.renderer.time, "cached_sections": cached_sections}
+
+
+def render_scenes_parallel(scenes_lst: list, scene_config: dict, scene_attrs: dict, jsons_path: Path,
+                           max_workers: int = None, on_scene_rendered=None):
+    """
+    Render independent scenes in a process pool. Every scene gets a private media dir (so Tex and partial movie
+    files of different workers never collide), and its sections are merged into jsons_path in the order of scenes_lst.
+    on_scene_rendered is called (in the same order) for every merged scene, also when other scenes failed.
+    """
+    media_path = Path(scene_config["media_dir"])
+    quality_dir = QUALITY_TO_DIR[scene_config["quality"]]
+    scene_media_paths = [media_path / PARALLEL_MEDIA_DIR_NAME / scene.__name__ for scene in scenes_lst]
+    # a preview per worker would open players on files that are about to be moved
+    worker_configs = [{**scene_config, "preview": False, "media_dir": scene_media_path} for scene_media_path in
+                      scene_media_paths]
+
+    jsons_path.mkdir(parents=True, exist_ok=True)
+    errors = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(render_scene, scene, worker_config, scene_attrs) for
+                   scene, worker_config in zip(scenes_lst, worker_configs)]
+        for scene, future, scene_media_path in zip(scenes_lst, futures, scene_media_paths):
+            try:
+                stats = future.result()
+            except Exception as e:
+                print(f"Failed to render {scene.__name__}: {e!r}")
+                errors.append(e)
+                continue
+            merge_scene_media(stats["scene"], scene_media_path / SECTIONS_MEDIA_PATH.format(quality_dir=quality_dir),
+                              jsons_path)
+            for profile_file in (scene_media_path / PROFILES_DIR_NAME).glob(f"{stats['scene']}*"):
+                (media_path / PROFILES_DIR_NAME).mkdir(parents=True, exist_ok=True)
+                os.replace(profile_file, media_path / PROFILES_DIR_NAME / profile_file.name)
+            if on_scene_rendered is not None:
+                on_scene_rendered(scene, stats)
+    if errors:
+        raise errors[0]
+
+
+def merge_scene_media(scene_name: str, scene_sections_path: Path, jsons_path: Path):
+    """Move the sections (json and clips) and the full movie of a scene rendered in a private media dir."""
+    for file in scene_sections_path.glob(f"{scene_name}*"):
+        os.replace(file, jsons_path / file.name)
+    scene_movie = scene_sections_path.with_name(scene_name + ".mp4")
+    if scene_movie.exists():
+        os.replace(scene_movie, jsons_path.with_name(scene_movie.name))
 
 
 def create_scene_gif(out_dir: str | Path, scene_name, section_num_lst: list[int], quality_dir: str, media_dir=None,
-                     gif_name: str = None):
+                     gif_name: str = None, gif_format: str = "gif", resize: float = DEFAULT_GIF_RESIZE,
+                     fps: int = DEFAULT_GIF_FPS):
     """
-    Create a gif from the video file.
+    Create a gif from the video file. The section clips are streamed through ffmpeg (concat demuxer, then fps and
+    scale filters), so memory stays flat no matter how many sections are used.
     :param media_dir:
     :param out_dir: Name of the directory run_scenes() was called with.
     :param section_num_lst: Number of the section to create a gif from.
+    :param gif_format: One of GIF_FORMATS_OPTIONS. webp and apng are much smaller than gif for the site previews.
     """
+    if gif_format not in GIF_FORMATS_OPTIONS:
+        raise ValueError(f"Invalid gif format: {gif_format}, choose from {list(GIF_FORMATS_OPTIONS)}")
     if gif_name is None:
         gif_name = scene_name
     out_dir = Path(out_dir) if isinstance(out_dir, str) else out_dir
     gif_dir = out_dir / "gifs"
     gif_dir.mkdir(parents=True, exist_ok=True)
 
-    clips = [VideoFileClip(str(media_dir / SECTIONS_MEDIA_PATH.format(quality_dir=quality_dir) / SCENE_CLIP_NAME.format(
-        scene_name=scene_name, section_num=i))).resize(DEFAULT_GIF_RESIZE) for i in section_num_lst]
-
-    concatenate_videoclips(clips).write_gif(str(gif_dir / f"{gif_name}.gif"), fps=13)
+    sections_path = Path(media_dir) / SECTIONS_MEDIA_PATH.format(quality_dir=quality_dir)
+    clips = [sections_path / SCENE_CLIP_NAME.format(scene_name=scene_name, section_num=i) for i in section_num_lst]
+    gif_path = gif_dir / f"{gif_name}.{gif_format}"
+    frames_filter = f"fps={fps},scale=trunc(iw*{resize}/2)*2:-2:flags=lanczos"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        concat_list = Path(tmp_dir) / "clips.txt"
+        with open(concat_list, "w", encoding="utf-8") as f:
+            f.writelines(f"file '{get_ffmpeg_concat_path(clip)}'\n" for clip in clips)
+        concat_input = ["-f", "concat", "-safe", "0", "-i", str(concat_list)]
+        if gif_format == "gif":
+            # two streamed passes: a palette over all frames, then the frames mapped to it. A single split graph
+            # would have to buffer every frame until the palette is ready.
+            palette = Path(tmp_dir) / "palette.png"
+            run_ffmpeg(concat_input + ["-vf", f"{frames_filter},palettegen=stats_mode=diff", str(palette)])
+            run_ffmpeg(concat_input + ["-i", str(palette), "-lavfi", f"{frames_filter}[x];[x][1:v]{GIF_PALETTE_USE}"] +
+                       GIF_FORMATS_OPTIONS[gif_format] + [str(gif_path)])
+        else:
+            run_ffmpeg(concat_input + ["-vf", frames_filter, "-an"] + GIF_FORMATS_OPTIONS[gif_format] + [str(gif_path)])
+    return gif_path
 
 
 def run_manim_editor(scenes_lst: list, jsons_path: Path | str, movie_name: str, description_title: str = "",
-                     description: str = ""):
+                     description: str = "", media_store: bool = False, renditions: tuple[int] = None):
     jsons_path = Path(jsons_path) if isinstance(jsons_path, str) else jsons_path
     section_index_paths = [(jsons_path / scene.__name__).with_suffix(".json") for scene in scenes_lst]
-    run_quick_present_export(section_index_paths, movie_name, description_title, description)
+    run_quick_present_export(section_index_paths, movie_name, description_title, description, media_store, renditions)
 
 
 def reorder_manedit_dirs_structure(movie_path: Path | str):
@@ -155,9 +336,12 @@ def manim_editor_autocreated_scene_fix(json_path: Path | str):
 
 # ----------------------------------- manim editor -----------------------------------
 def run_quick_present_export(section_index_paths: List[Path], movie_name: str, description_title: str = "",
-                             description: str = ""):
+                             description: str = "", media_store: bool = False, renditions: tuple[int] = None):
     """Create a project from scene(s) and export the presentation.
     Using the name of the first project if ``project_name`` is not given.
+    :param media_store: Keep the videos and thumbnails in the content addressed store shared by all movies (see
+     media_store.py) instead of a media dir per movie.
+    :param renditions: Heights of the HLS renditions to export, see export_movie.
     """
     manim_editor.set_config(manim_editor.config.Config)
     movie_dir = MOVIES_PATH / movie_name
@@ -172,17 +356,17 @@ def run_quick_present_export(section_index_paths: List[Path], movie_name: str, d
             raise RuntimeError(f"Couldn't find a section index file at '{section_index_path}'.")
         sections += scene.sections
 
-    if not populate_project_with_loaded_sections(movie_name, movie_dir, out_media_dir, sections):
+    if not populate_project_with_loaded_sections(movie_name, movie_dir, out_media_dir, sections, media_store):
         raise RuntimeError("Failed to populate project.")
 
     slides = get_project(movie_dir)[-1]
     if movie_name is None:
         raise RuntimeError("Failed to load project.")
-    export_movie(movie_name, movie_dir, slides, description_title, description)
+    export_movie(movie_name, movie_dir, slides, description_title, description, renditions)
 
 
 def populate_project_with_loaded_sections(movie_name: str, movie_dir: Path, out_media_dir: Path,
-                                          sections: List[Section]) -> bool:
+                                          sections: List[Section], media_store: bool = False) -> bool:
     if not len(sections):
         raise RuntimeError(f"No sections given for project '{movie_name}'.")
     if sections[0].is_sub_section:
@@ -204,6 +388,8 @@ def populate_project_with_loaded_sections(movie_name: str, movie_dir: Path, out_
     for slide in slides:
         for section in slide.sections:
             section.project_name = movie_name
+    if media_store:
+        store_exported_sections(slides, movie_dir, out_media_dir)
 
     # write project file
     with open(movie_dir / "project.json", "w") as file:
@@ -213,8 +399,22 @@ def populate_project_with_loaded_sections(movie_name: str, movie_dir: Path, out_
 
 def export_movie(movie_name: str, movie_dir: Path,
                  slides: List[manim_editor.editor.presentation_classes.Slide], description_title="",
-                 description="") -> None:
+                 description="", renditions: tuple[int] = None,
+                 prefetch_sections: int = DEFAULT_PREFETCH_SECTIONS) -> None:
+    """
+    Write the presentation page of the movie.
+    :param renditions: Heights to encode every section at (see renditions.export_renditions). The manifest is embedded
+     in the page, which then plays every section at the largest rendition the connection and screen can take.
+    :param prefetch_sections: Number of upcoming sections the page fetches (with their thumbnails) while a slide
+     plays, so advancing doesn't wait for a fresh request. The per slide manifest is also saved to prefetch.json.
+     0 disables prefetching.
+    """
     print(f"Exporting Movie '{movie_name}' as presentation.")
+    renditions_manifest = None if renditions is None else export_renditions(slides, movie_dir, renditions)
+    prefetch_manifest = None
+    if prefetch_sections > 0:
+        prefetch_manifest = get_prefetch_manifest(slides, movie_dir, prefetch_sections, MOVIE_MEDIA_DIR_NAME)
+        save_prefetch_manifest(prefetch_manifest, movie_dir)
     jinja2_env = jinja2.Environment(
         loader=jinja2.FileSystemLoader(
             [
@@ -229,7 +429,7 @@ def export_movie(movie_name: str, movie_dir: Path,
     html = jinja2_env.get_template("edit_project.html").render(
         present_export=True, version=manim_editor.editor.config.get_config().VERSION, name=movie_name, slides=slides,
         url_for=manim_editor.editor.edit_project.emulate_url_for, description_title=description_title,
-        description=description)
+        description=description, renditions=renditions_manifest, prefetch=prefetch_manifest)
     with open(movie_dir / "index.html", "w", encoding="utf-8") as file:
         file.write(html)
     print(f"Movie is ready at '{Path(movie_name).absolute()}'")
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from manim import QUALITIES, Scene, tempconfig
+from manim.animation.animation import Wait
+from manim.utils import tex_file_writing
+
+from tools.scenes import SectionsScene
+
+CALIBRATION_NAME = "render_calibration.json"
+
+
+def plan_scene(scene: type[Scene], quality: str, media_path: Path, presentation_mode: bool = False) -> dict:
+    """
+    Construct the scene with all animations skipped and nothing written, and count what a real render would do.
+    Tex is compiled for real (it is needed to build the mobjects), so the compilations are timed and stay cached.
+    """
+    plan = {"scene": scene.__name__, "plays": 0, "waits": 0, "sections": 0, "animation_seconds": 0.0,
+            "tex": 0, "tex_compilations": 0, "tex_seconds": 0.0}
+    compile_tex = tex_file_writing.compile_tex
+
+    def counting_compile_tex(tex_file: Path, tex_compiler: str, output_format: str):
+        plan["tex"] += 1
+        if not tex_file.with_suffix(output_format).exists():
+            plan["tex_compilations"] += 1
+        start = time.perf_counter()
+        compiled = compile_tex(tex_file, tex_compiler, output_format)
+        plan["tex_seconds"] += time.perf_counter() - start
+        return compiled
+
+    tex_file_writing.compile_tex = counting_compile_tex
+    try:
+        with tempconfig({"quality": quality, "media_dir": media_path, "dry_run": True, "preview": False,
+                         "disable_caching": True}):
+            scene_obj = scene()
+            if isinstance(scene_obj, SectionsScene):
+                scene_obj.PRESENTATION_MODE = presentation_mode
+            renderer, file_writer = scene_obj.renderer, scene_obj.renderer.file_writer
+            renderer._original_skipping_status = renderer.skip_animations = True
+            play, next_section = renderer.play, file_writer.next_section
+
+            def counting_play(scene, *args, **kwargs):
+                play(scene, *args, **kwargs)
+                is_wait = len(scene.animations) == 1 and isinstance(scene.animations[0], Wait)
+                plan["waits" if is_wait else "plays"] += 1
+
+            def counting_next_section(*args, **kwargs):
+                plan["sections"] += 1
+                next_section(*args, **kwargs)
+
+            renderer.play, file_writer.next_section = counting_play, counting_next_section
+            scene_obj.render()
+            plan["animation_seconds"] = renderer.time
+    finally:
+        tex_file_writing.compile_tex = compile_tex
+
+    plan["frames"] = int(plan["animation_seconds"] * QUALITIES[quality]["frame_rate"])
+    return plan
+
+
+def plan_scenes(scenes_lst: list, quality: str, media_path: Path, presentation_mode: bool = False,
+                workers: int = 1) -> list[dict]:
+    """
+    Dry run every scene, estimate the render time from the calibration in media_path and print a report
+    :param workers: Number of scenes rendered at once (parallel mode). The estimate of every scene is its serial render
+     time, the total wall-clock time is divided between the workers.
+    """
+    seconds_per_pixel_frame = get_seconds_per_pixel_frame(media_path, quality)
+    pixels = QUALITIES[quality]["pixel_width"] * QUALITIES[quality]["pixel_height"]
+    plans = []
+    for scene in scenes_lst:
+        plan = plan_scene(scene, quality, media_path, presentation_mode)
+        plan["estimated_seconds"] = None if seconds_per_pixel_frame is None else \
+            plan["frames"] * pixels * seconds_per_pixel_frame
+        plans.append(plan)
+    print_plans(plans, quality, workers)
+    return plans
+
+
+def print_plans(plans: list[dict], quality: str, workers: int = 1):
+    columns = ["scene", "plays", "waits", "sections", "animation_seconds", "frames", "tex", "tex_compilations",
+               "tex_seconds", "estimated_seconds"]
+    total = {column: sum(plan[column] or 0 for plan in plans) for column in columns[1:]}
+    if any(plan["estimated_seconds"] is None for plan in plans):
+        total["estimated_seconds"] = None
+    print(f"Render plan ({quality}, {QUALITIES[quality]['pixel_height']}p{QUALITIES[quality]['frame_rate']}):")
+    print(" | ".join(f"{column:>17}" for column in columns))
+    for row in plans + [{"scene": "TOTAL", **total}]:
+        print(" | ".join(f"{format_plan_value(row[column]):>17}" for column in columns))
+    if total["estimated_seconds"] is None:
+        print("No calibration found, render once (any quality) to estimate the wall-clock time")
+    else:
+        # a worker can't render less than the longest scene
+        wall_seconds = max(total["estimated_seconds"] / max(workers, 1),
+                           max((plan["estimated_seconds"] for plan in plans), default=0))
+        parallel_note = f" on {workers} workers" if workers > 1 else ""
+        print(f"Estimated render time{parallel_note}: {time.strftime('%H:%M:%S', time.gmtime(wall_seconds))}")
+
+
+def format_plan_value(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+# ----------------------------------- calibration -----------------------------------
+def update_calibration(media_path: Path, quality: str, render_stats: list[dict]):
+    """
+    Keep the render speed of the last real run per quality. render_stats are the dicts returned by render_scene
+    (wall seconds and animation seconds of a rendered scene). Scenes that reused sections from the section cache
+    didn't render all of their frames and are left out, as are the scenes incremental rendering skipped (they have no
+    stats). In parallel mode the seconds of every scene are measured in its worker, so they sum to the serial time.
+    """
+    render_stats = [stats for stats in render_stats if not stats.get("cached_sections")]
+    if not render_stats:
+        return
+    calibration_path = Path(media_path) / CALIBRATION_NAME
+    calibration = {}
+    if calibration_path.exists():
+        with open(calibration_path, "r") as f:
+            calibration = json.load(f)
+    calibration[quality] = {"seconds": sum(stats["seconds"] for stats in render_stats),
+                            "frames": sum(stats["animation_seconds"] for stats in render_stats) *
+                                      QUALITIES[quality]["frame_rate"]}
+    with open(calibration_path, "w") as f:
+        json.dump(calibration, f, indent=4)
+
+
+def get_seconds_per_pixel_frame(media_path: Path, quality: str) -> float | None:
+    """Render seconds per frame pixel, taken from the calibration of the same quality when possible"""
+    calibration_path = Path(media_path) / CALIBRATION_NAME
+    if not calibration_path.exists():
+        return None
+    with open(calibration_path, "r") as f:
+        calibration = json.load(f)
+    calibrated = [quality] if quality in calibration else [q for q in calibration if q in QUALITIES]
+    for calibrated_quality in calibrated:
+        speed = calibration[calibrated_quality]
+        pixels = QUALITIES[calibrated_quality]["pixel_width"] * QUALITIES[calibrated_quality]["pixel_height"]
+        if speed["frames"] > 0:
+            return speed["seconds"] / (speed["frames"] * pixels)
+    return None
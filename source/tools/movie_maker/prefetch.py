@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+PREFETCH_MANIFEST_NAME = "prefetch.json"
+DEFAULT_PREFETCH_SECTIONS = 3
+
+
+def get_prefetch_manifest(slides: list, movie_dir: Path, prefetch_sections: int = DEFAULT_PREFETCH_SECTIONS,
+                          media_dir_name: str = "") -> dict:
+    """
+    Per slide, its sections (url, bytes and duration) and the next prefetch_sections sections after it, which the
+    presentation page loads (with the thumbnails of their slides) while the slide plays.
+    :param media_dir_name: Dir under movie_dir the exported files end up in (see reorder_manedit_dirs_structure).
+    """
+    sections = [section for slide in slides for section in slide.sections]
+    section_dicts = {section.in_project_id: get_section_prefetch_dict(section, movie_dir, media_dir_name) for section
+                     in sections}
+    slide_of_section = {section.in_project_id: slide.sections[0].in_project_id for slide in slides for section in
+                        slide.sections}
+    manifest = {"prefetch_sections": prefetch_sections, "slides": []}
+    for slide in slides:
+        last_index = sections.index(slide.sections[-1])
+        upcoming = [section.in_project_id for section in sections[last_index + 1:last_index + 1 + prefetch_sections]]
+        manifest["slides"].append({
+            "id": slide.sections[0].in_project_id,
+            "sections": [section_dicts[section.in_project_id] for section in slide.sections],
+            "prefetch": [section_dicts[section_id] for section_id in upcoming],
+            # slides whose thumbnails to load, the timeline shows one per slide
+            "prefetch_slides": sorted({slide_of_section[section_id] for section_id in upcoming})})
+    return manifest
+
+
+def get_section_prefetch_dict(section, movie_dir: Path, media_dir_name: str = "") -> dict:
+    video = movie_dir / section.in_project_video
+    if not video.exists():
+        video = movie_dir / media_dir_name / section.in_project_video
+    return {"id": section.in_project_id, "url": Path(os.path.relpath(video, movie_dir)).as_posix(),
+            "bytes": video.stat().st_size if video.exists() else None, "duration": section.duration}
+
+
+def save_prefetch_manifest(manifest: dict, movie_dir: Path):
+    with open(movie_dir / PREFETCH_MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=4)
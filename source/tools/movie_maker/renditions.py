@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+from tools.movie_maker.ffmpeg import run_ffmpeg
+from tools.movie_maker.media_store import RENDITIONS_DIR_NAME, RENDITIONS_MANIFEST_NAME, get_file_hash, \
+    get_store_path
+
+DEFAULT_RENDITION_HEIGHTS = (480, 720, 1440)
+# short segments (with a keyframe at every segment start) let a section start playing after the first small fetch
+HLS_SEGMENT_SECONDS = 1
+SECTION_NAME = "section"
+MASTER_PLAYLIST_NAME = "master.m3u8"
+RENDITION_NAME = "{height}p"
+RENDITION_ENCODE_OPTIONS = ["-c:v", "libx264", "-preset", "slow", "-crf", "23", "-pix_fmt", "yuv420p",
+                            "-sc_threshold", "0", "-an"]
+FRAGMENTED_MP4_FLAGS = ["-movflags", "frag_keyframe+empty_moov+default_base_moof"]
+
+
+def get_renditions_store_path(movie_dir: Path) -> Path:
+    return get_store_path(movie_dir.parent) / RENDITIONS_DIR_NAME
+
+
+def export_renditions(slides: list, movie_dir: Path, heights: tuple[int] = DEFAULT_RENDITION_HEIGHTS,
+                      segment_seconds: float = HLS_SEGMENT_SECONDS) -> dict:
+    """
+    Encode every section at every height (up to the rendered one) into the content addressed store (see
+    media_store.py), under store/renditions/<hash of the source clip>:
+    - <height>p/section.mp4, a fragmented mp4 with a fragment per segment, playable by the presentation page. The
+      rendered height is stream copied, not encoded again.
+    - <height>p/section.m3u8 with its fMP4 segments, and a master playlist master.m3u8 over all heights.
+    Renditions of a clip are reused by any movie and any section id that has the same clip. The manifest (also
+    written to renditions.json) lists per section the duration and per rendition the urls (relative to movie_dir),
+    resolution and bandwidth.
+    """
+    renditions_store = get_renditions_store_path(movie_dir)
+    # renditions of older exports, kept per movie and keyed by section id
+    shutil.rmtree(movie_dir / RENDITIONS_DIR_NAME, ignore_errors=True)
+    manifest = {"segment_seconds": segment_seconds, "renditions": [], "sections": []}
+    for slide in slides:
+        for section in slide.sections:
+            source = Path(section.original_video)
+            renditions_dir = renditions_store / get_file_hash(source)
+            section_heights = sorted({height for height in heights if height < section.height} | {section.height})
+            variants = {}
+            for height in section_heights:
+                rendition = RENDITION_NAME.format(height=height)
+                width = round(section.width * height / section.height / 2) * 2
+                rendition_dir = renditions_dir / rendition
+                rendition_dir.mkdir(parents=True, exist_ok=True)
+                video = rendition_dir / f"{SECTION_NAME}.mp4"
+                playlist = video.with_suffix(".m3u8")
+                if not playlist.exists():
+                    if height == section.height:
+                        copy_rendition(source, video)
+                    else:
+                        encode_rendition(source, video, width, height, segment_seconds)
+                    segment_rendition(video, playlist, segment_seconds)
+                segments = list(rendition_dir.glob(f"{SECTION_NAME}_[0-9]*.m4s"))
+                variants[rendition] = {
+                    "video": video.relative_to(movie_dir).as_posix(),
+                    "playlist": playlist.relative_to(movie_dir).as_posix(), "width": width, "height": height,
+                    "bytes": video.stat().st_size,
+                    "bandwidth": max((segment.stat().st_size * 8 / segment_seconds for segment in segments),
+                                     default=0),
+                    "average_bandwidth": video.stat().st_size * 8 / max(section.duration, segment_seconds)}
+                if rendition not in manifest["renditions"]:
+                    manifest["renditions"].append(rendition)
+            master_playlist = renditions_dir / MASTER_PLAYLIST_NAME
+            write_master_playlist(master_playlist, variants, movie_dir)
+            manifest["sections"].append({"id": section.in_project_id, "duration": section.duration,
+                                         "master_playlist": master_playlist.relative_to(movie_dir).as_posix(),
+                                         "variants": variants})
+    manifest["renditions"].sort(key=lambda rendition: int(rendition[:-1]))
+    with open(movie_dir / RENDITIONS_MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def encode_rendition(source: Path, video: Path, width: int, height: int, segment_seconds: float):
+    run_ffmpeg(["-i", str(source), "-vf", f"scale={width}:{height}:flags=lanczos",
+                "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})"] + RENDITION_ENCODE_OPTIONS +
+               FRAGMENTED_MP4_FLAGS + [str(video)])
+
+
+def copy_rendition(source: Path, video: Path):
+    """The source clip as a fragmented mp4, without encoding. Fragments start at the keyframes of the source."""
+    run_ffmpeg(["-i", str(source), "-c:v", "copy", "-an"] + FRAGMENTED_MP4_FLAGS + [str(video)])
+
+
+def segment_rendition(video: Path, playlist: Path, segment_seconds: float):
+    """Split an encoded rendition into HLS fMP4 segments without re-encoding"""
+    for old_segment in playlist.parent.glob(f"{playlist.stem}_*.m4s"):
+        old_segment.unlink()
+    run_ffmpeg(["-i", str(video), "-c", "copy", "-f", "hls", "-hls_time", str(segment_seconds),
+                "-hls_playlist_type", "vod", "-hls_segment_type", "fmp4",
+                "-hls_fmp4_init_filename", f"{playlist.stem}_init.mp4",
+                "-hls_segment_filename", str(playlist.with_name(f"{playlist.stem}_%03d.m4s")), str(playlist)])
+
+
+def write_master_playlist(master_playlist: Path, variants: dict[str, dict], movie_dir: Path):
+    lines = ["#EXTM3U", "#EXT-X-VERSION:7", "#EXT-X-INDEPENDENT-SEGMENTS"]
+    for variant in variants.values():
+        lines += [f"#EXT-X-STREAM-INF:BANDWIDTH={int(variant['bandwidth'])},"
+                  f"AVERAGE-BANDWIDTH={int(variant['average_bandwidth'])},"
+                  f"RESOLUTION={variant['width']}x{variant['height']},CODECS=\"avc1.640028\"",
+                  (movie_dir / variant["playlist"]).relative_to(master_playlist.parent).as_posix()]
+    master_playlist.write_text("\n".join(lines) + "\n")
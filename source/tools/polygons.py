@@ -0,0 +1,142 @@
+"""
+Boolean operations on polygons as plain point arrays, converted to a Polygon mobject only at the end.
+The skia backend (the default) goes through manim's Union/Intersection/Difference (skia-pathops) and samples the
+resulting curves back into points. The shapely backend clips the polygons directly. shapely is optional and only used
+when selected (set_polygon_backend or backend=), so a deck draws the same shapes on every machine.
+"""
+
+from __future__ import annotations
+
+from functools import reduce
+
+import numpy as np
+from manim import Difference, Intersection, Mobject, Polygon, Union
+from scipy.spatial import ConvexHull
+
+try:
+    from shapely.geometry import MultiPolygon, Polygon as ShapelyPolygon
+    from shapely.ops import unary_union
+except ImportError:
+    ShapelyPolygon = None
+
+DUPLICATE_POINTS_ATOL = 1.e-1  # for one point per curve, divided by the samples per curve
+POLYGON_OPERATIONS = ("union", "intersection", "difference")
+
+
+# ---------------------------- points ----------------------------
+def get_mobject_points(mobject: Mobject | np.ndarray, samples_per_curve: int = 1) -> np.ndarray:
+    """
+    Points along the curves of a mobject (N x 3): the end of every cubic curve, and samples_per_curve - 1 more
+    points inside it (to keep the shape of arcs). Point arrays are returned as 3D points.
+    """
+    if not isinstance(mobject, Mobject):
+        points = np.asarray(mobject, dtype=float)
+        return np.hstack([points[:, :2], np.zeros((len(points), 1))]) if points.shape[1] == 2 else points
+    curves = mobject.points.reshape(-1, 4, 3)
+    alphas = np.arange(1, samples_per_curve + 1) / samples_per_curve
+    # cubic bernstein basis of every alpha, (samples, 4)
+    basis = np.stack([(1 - alphas) ** 3, 3 * alphas * (1 - alphas) ** 2, 3 * alphas ** 2 * (1 - alphas), alphas ** 3],
+                     axis=1)
+    return np.einsum("sk,ckd->csd", basis, curves).reshape(-1, 3)
+
+
+def remove_close_points(points: np.ndarray, atol: float = DUPLICATE_POINTS_ATOL) -> np.ndarray:
+    """
+    Drop every point closer than atol (in each coordinate) to the last kept point, and the closing points that are
+    that close to the first one. A densely sampled chain is thinned to a point every atol, not collapsed.
+    """
+    if len(points) < 2:
+        return points
+    keep = [0]
+    for i in range(1, len(points)):
+        if np.max(np.abs(points[i] - points[keep[-1]])) > atol:
+            keep.append(i)
+    while len(keep) > 1 and np.max(np.abs(points[keep[-1]] - points[0])) <= atol:
+        keep.pop()
+    return points[keep]
+
+
+def points_to_polygon(points: np.ndarray, convex_hull: bool = False, atol: float = DUPLICATE_POINTS_ATOL,
+                      **kwargs) -> Polygon:
+    points = get_mobject_points(points)
+    if convex_hull:
+        points = points[ConvexHull(points[:, :2]).vertices]
+    return Polygon(*remove_close_points(points, atol), **kwargs)
+
+
+# ---------------------------- backends ----------------------------
+def _skia_boolean_op(operation: str, polygons: list[np.ndarray], samples_per_curve: int = 1) -> np.ndarray:
+    mobjects = [Polygon(*points) for points in polygons]
+    if operation == "union":
+        result = Union(*mobjects)
+    elif operation == "intersection":
+        result = reduce(Intersection, mobjects)
+    else:
+        result = Difference(mobjects[0], Union(*mobjects[1:]) if len(mobjects) > 2 else mobjects[1])
+    return get_mobject_points(result, samples_per_curve)
+
+
+def _shapely_boolean_op(operation: str, polygons: list[np.ndarray], samples_per_curve: int = 1) -> np.ndarray:
+    """
+    The outline of the result. Unlike skia, holes are dropped and only the largest part of a disconnected result is
+    kept, so only select it for shapes that stay simple (e.g. unions of overlapping convex cells).
+    """
+    shapes = [ShapelyPolygon(points[:, :2]).buffer(0) for points in polygons]
+    if operation == "union":
+        result = unary_union(shapes)
+    elif operation == "intersection":
+        result = reduce(lambda a, b: a.intersection(b), shapes)
+    else:
+        result = shapes[0].difference(unary_union(shapes[1:]))
+    if isinstance(result, MultiPolygon):
+        result = max(result.geoms, key=lambda part: part.area)
+    if result.is_empty or not hasattr(result, "exterior"):
+        return np.zeros((0, 3))
+    return get_mobject_points(np.array(result.exterior.coords)[:-1])
+
+
+POLYGON_BACKENDS = {"skia": _skia_boolean_op}
+if ShapelyPolygon is not None:
+    POLYGON_BACKENDS["shapely"] = _shapely_boolean_op
+polygon_backend = "skia"
+
+
+def set_polygon_backend(backend: str):
+    global polygon_backend
+    if backend not in POLYGON_BACKENDS:
+        raise ValueError(f"Unknown polygon backend '{backend}', available: {list(POLYGON_BACKENDS)}")
+    polygon_backend = backend
+
+
+# ---------------------------- operations ----------------------------
+def polygons_boolean_op(operation: str, *polygons: Mobject | np.ndarray, backend: str = None,
+                        samples_per_curve: int = 1) -> np.ndarray:
+    """
+    Points of the union/intersection/difference (first minus the rest) of mobjects or point arrays.
+    :param samples_per_curve: Points per curve of the mobjects (and of the skia result), more keep arcs round.
+    """
+    if operation not in POLYGON_OPERATIONS:
+        raise ValueError(f"Unknown polygon operation '{operation}', available: {POLYGON_OPERATIONS}")
+    points = [get_mobject_points(polygon, samples_per_curve) for polygon in polygons]
+    return POLYGON_BACKENDS[backend or polygon_backend](operation, points, samples_per_curve)
+
+
+def polygons_union(*polygons: Mobject | np.ndarray, convex_hull: bool = False, backend: str = None,
+                   samples_per_curve: int = 1, **kwargs) -> Polygon:
+    return points_to_polygon(polygons_boolean_op("union", *polygons, backend=backend,
+                                                 samples_per_curve=samples_per_curve), convex_hull,
+                             DUPLICATE_POINTS_ATOL / samples_per_curve, **kwargs)
+
+
+def polygons_intersection(*polygons: Mobject | np.ndarray, convex_hull: bool = False, backend: str = None,
+                          samples_per_curve: int = 1, **kwargs) -> Polygon:
+    return points_to_polygon(polygons_boolean_op("intersection", *polygons, backend=backend,
+                                                 samples_per_curve=samples_per_curve), convex_hull,
+                             DUPLICATE_POINTS_ATOL / samples_per_curve, **kwargs)
+
+
+def polygons_difference(*polygons: Mobject | np.ndarray, convex_hull: bool = False, backend: str = None,
+                        samples_per_curve: int = 1, **kwargs) -> Polygon:
+    return points_to_polygon(polygons_boolean_op("difference", *polygons, backend=backend,
+                                                 samples_per_curve=samples_per_curve), convex_hull,
+                             DUPLICATE_POINTS_ATOL / samples_per_curve, **kwargs)
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import csv
+import html
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from manim import Mobject, Scene
+from manim.animation.animation import Wait
+from manim.utils import tex_file_writing
+from manim.utils.simple_functions import get_parameters
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+PROFILES_DIR_NAME = "profiles"
+PLAY_COLUMNS = ["index", "section_index", "section", "kind", "animations", "wall_seconds", "updaters_seconds",
+                "rasterize_seconds", "encode_seconds", "other_seconds", "frames", "construct_seconds", "tex_seconds",
+                "mobjects", "points", "peak_rss_mb"]
+SECTION_COLUMNS = ["section_index", "section", "plays", "wall_seconds", "updaters_seconds", "rasterize_seconds",
+                   "encode_seconds", "other_seconds", "frames", "construct_seconds", "tex_seconds", "mobjects",
+                   "points", "peak_rss_mb"]
+SUMMED_COLUMNS = ["wall_seconds", "updaters_seconds", "rasterize_seconds", "encode_seconds", "other_seconds", "frames",
+                  "construct_seconds", "tex_seconds"]
+
+
+class SceneProfiler:
+    """
+    Times every play/wait of a scene and splits it into updaters (all Mobject.update calls), frame rasterization
+    (renderer.update_frame) and encoding (writing the frames to ffmpeg). The time between two plays (building
+    mobjects, Tex) is kept as the construct time of the following play. Every record also holds the number of mobjects
+    and points on screen and the peak RSS of the process so far.
+    """
+
+    def __init__(self, scene: Scene):
+        self.scene = scene
+        self.section = "unnamed"
+        self.section_index = 0  # section names repeat (unnamed, or the same helper every slide)
+        self.plays: list[dict] = []
+        self.updaters: dict[str, float] = defaultdict(float)  # updater qualified name -> seconds
+        self.current = self.new_counters()
+        self.last_play_end = None
+        self.update_depth = 0
+        self.originals = {}
+
+    @staticmethod
+    def new_counters() -> dict:
+        return {"updaters_seconds": 0.0, "rasterize_seconds": 0.0, "encode_seconds": 0.0, "frames": 0,
+                "tex_seconds": 0.0}
+
+    def start_section(self, name: str):
+        self.section = name
+        self.section_index += 1
+
+    # ----------------- Instrumentation ----------------- #
+
+    def attach(self):
+        renderer, file_writer = self.scene.renderer, self.scene.renderer.file_writer
+        self.originals = {"play": renderer.play, "update_frame": renderer.update_frame,
+                          "write_frame": file_writer.write_frame, "compile_tex": tex_file_writing.compile_tex,
+                          "update": Mobject.update}
+        renderer.play = self.timed_play
+        renderer.update_frame = self.timed("rasterize_seconds", self.originals["update_frame"])
+        file_writer.write_frame = self.timed("encode_seconds", self.originals["write_frame"], count_frames=True)
+        tex_file_writing.compile_tex = self.timed("tex_seconds", self.originals["compile_tex"])
+        profiler = self
+
+        def timed_update(mobject: Mobject, dt: float = 0, recursive: bool = True):
+            return profiler.timed_update(mobject, dt, recursive)
+
+        Mobject.update = timed_update
+        self.last_play_end = time.perf_counter()
+
+    def detach(self):
+        renderer = self.scene.renderer
+        renderer.play, renderer.update_frame = self.originals["play"], self.originals["update_frame"]
+        renderer.file_writer.write_frame = self.originals["write_frame"]
+        tex_file_writing.compile_tex = self.originals["compile_tex"]
+        Mobject.update = self.originals["update"]
+
+    def timed(self, counter: str, func, count_frames: bool = False):
+        def timed_func(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.current[counter] += time.perf_counter() - start
+            if count_frames:
+                self.current["frames"] += 1
+            return result
+
+        return timed_func
+
+    def timed_play(self, scene: Scene, *args, **kwargs):
+        start = time.perf_counter()
+        construct_counters, self.current = self.current, self.new_counters()
+        self.originals["play"](scene, *args, **kwargs)
+        end = time.perf_counter()
+        is_wait = len(scene.animations) == 1 and isinstance(scene.animations[0], Wait)
+        family = [mob for mobject in scene.mobjects for mob in mobject.get_family()]
+        record = {"index": len(self.plays), "section_index": self.section_index, "section": self.section,
+                  "kind": "wait" if is_wait else "play",
+                  "animations": ", ".join(type(animation).__name__ for animation in scene.animations),
+                  "wall_seconds": end - start, **self.current, "construct_seconds": start - self.last_play_end,
+                  # Tex compiled while building the mobjects of this play counts for it as well
+                  "tex_seconds": construct_counters["tex_seconds"] + self.current["tex_seconds"],
+                  "mobjects": len(family), "points": sum(len(mob.points) for mob in family),
+                  "peak_rss_mb": get_peak_rss_mb()}
+        record["other_seconds"] = record["wall_seconds"] - record["updaters_seconds"] - \
+                                  record["rasterize_seconds"] - record["encode_seconds"]
+        self.plays.append(record)
+        self.current = self.new_counters()
+        self.last_play_end = time.perf_counter()
+
+    def timed_update(self, mobject: Mobject, dt: float = 0, recursive: bool = True):
+        """Mobject.update, with every updater timed on its own. Nested updates are only counted once."""
+        if mobject.updating_suspended:
+            return mobject
+        self.update_depth += 1
+        start = time.perf_counter()
+        try:
+            for updater in mobject.updaters:
+                updater_start = time.perf_counter()
+                if "dt" in get_parameters(updater):
+                    updater(mobject, dt)
+                else:
+                    updater(mobject)
+                self.updaters[getattr(updater, "__qualname__", repr(updater))] += time.perf_counter() - updater_start
+            if recursive:
+                for submob in mobject.submobjects:
+                    submob.update(dt, recursive)
+        finally:
+            self.update_depth -= 1
+        if self.update_depth == 0:
+            self.current["updaters_seconds"] += time.perf_counter() - start
+        return mobject
+
+    # ----------------- Reports ----------------- #
+
+    def get_sections(self) -> list[dict]:
+        """The plays summed per section, sections are told apart by their index as their names may repeat"""
+        sections = {}
+        for play in self.plays:
+            section = sections.setdefault(play["section_index"], {"section_index": play["section_index"],
+                                                                  "section": play["section"], "plays": 0,
+                                                                  **{column: 0 for column in SUMMED_COLUMNS}})
+            section["plays"] += 1
+            for column in SUMMED_COLUMNS:
+                section[column] += play[column]
+            for column in ("mobjects", "points", "peak_rss_mb"):
+                section[column] = max(section.get(column) or 0, play[column] or 0)
+        return list(sections.values())
+
+    def get_report(self) -> dict:
+        updaters = sorted(({"updater": name, "seconds": seconds} for name, seconds in self.updaters.items()),
+                          key=lambda updater: updater["seconds"], reverse=True)
+        return {"scene": type(self.scene).__name__, "plays": self.plays, "sections": self.get_sections(),
+                "updaters": updaters}
+
+    def save(self, out_dir: Path) -> Path:
+        """Write <scene>.json with everything, <scene>_plays.csv, <scene>_sections.csv and a sortable <scene>.html"""
+        out_dir.mkdir(parents=True, exist_ok=True)
+        report = self.get_report()
+        report_path = out_dir / f"{report['scene']}.json"
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=4)
+        for name, rows, columns in (("plays", report["plays"], PLAY_COLUMNS),
+                                    ("sections", report["sections"], SECTION_COLUMNS)):
+            with open(out_dir / f"{report['scene']}_{name}.csv", "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=columns)
+                writer.writeheader()
+                writer.writerows(rows)
+        with open(out_dir / f"{report['scene']}.html", "w") as f:
+            f.write(get_report_html(report))
+        print(f"Profile of {report['scene']} saved to {report_path.with_suffix('.html')}")
+        return report_path
+
+
+def get_peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on mac
+    return peak_rss / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def get_report_html(report: dict) -> str:
+    tables = [("Sections", report["sections"], SECTION_COLUMNS), ("Plays", report["plays"], PLAY_COLUMNS),
+              ("Updaters", report["updaters"], ["updater", "seconds"])]
+    body = "\n".join(f"<h2>{title}</h2>\n{get_html_table(rows, columns)}" for title, rows, columns in tables)
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{html.escape(report["scene"])} profile</title>
+<style>
+body {{font-family: sans-serif;}}
+table {{border-collapse: collapse;}}
+th, td {{border: 1px solid #ccc; padding: 2px 6px; text-align: right;}}
+th {{cursor: pointer; background: #eee;}}
+</style>
+</head>
+<body>
+<h1>{html.escape(report["scene"])}</h1>
+{body}
+<script>
+document.querySelectorAll("th").forEach(th => th.addEventListener("click", () => {{
+    const table = th.closest("table"), column = th.cellIndex, body = table.tBodies[0];
+    const descending = th.dataset.order !== "desc";
+    th.dataset.order = descending ? "desc" : "asc";
+    const value = row => {{
+        const text = row.cells[column].textContent, number = parseFloat(text);
+        return isNaN(number) ? text : number;
+    }};
+    [...body.rows].sort((a, b) => (value(a) > value(b) ? 1 : value(a) < value(b) ? -1 : 0) * (descending ? -1 : 1))
+        .forEach(row => body.appendChild(row));
+}}));
+</script>
+</body>
+</html>
+"""
+
+
+def get_html_table(rows: list[dict], columns: list[str]) -> str:
+    header = "".join(f"<th>{html.escape(column)}</th>" for column in columns)
+    lines = ["".join(f"<td>{html.escape(format_report_value(row.get(column)))}</td>" for column in columns)
+             for row in rows]
+    body = "\n".join(f"<tr>{line}</tr>" for line in lines)
+    return f"<table>\n<thead><tr>{header}</tr></thead>\n<tbody>\n{body}\n</tbody>\n</table>"
+
+
+def format_report_value(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
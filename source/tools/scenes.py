@@ -1,20 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import shutil
+from pathlib import Path
+
 from manim import *
+from manim.utils.hashing import get_hash_from_play_call
 from manim_editor import PresentationSectionType as pst
 from tools.consts import BACKGROUND_COLOR
+from tools.profiling import PROFILES_DIR_NAME, SceneProfiler
 
 config.background_color = BACKGROUND_COLOR
 
+SECTION_CACHE_DIR_NAME = "section_cache"
+
 
 class SectionsScene(Scene):
     PRESENTATION_MODE = False
+    SECTION_CACHE = False  # reuse the clips of unchanged sections, see cache_section
+    PROFILE = False  # time every play and section, see tools.profiling.SceneProfiler
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sections_cache_keys = {}  # file writer section -> (cache key, reused from cache)
+        self.section_cache_miss = False
+        self.profiler = None
 
     def next_section(self, name: str = "unnamed", type: str = pst.SUB_NORMAL, skip_animations: bool = False,
                      skip_section: bool = False):
         if skip_section:
             return
+        if self.profiler is not None:
+            self.profiler.start_section(name)
         if self.PRESENTATION_MODE:
             if len(self.renderer.file_writer.sections) > 1:
                 self.wait(0.3)
-            super().next_section(name, type, skip_animations)
+            if self.SECTION_CACHE and not skip_animations:
+                self.cache_section(name, type, inspect.currentframe().f_back)
+            else:
+                super().next_section(name, type, skip_animations)
         else:
             self.wait()
+
+    # ----------------- Section cache ----------------- #
+
+    def cache_section(self, name: str, type: str, caller_frame):
+        """
+        Start a section whose clip is cached under a key built from the scene state at the section boundary and the
+        code producing it. Until the first changed section, cached sections are only played with skipped animations
+        (to advance the scene state) and their clips are reused byte for byte in render().
+        """
+        key = self.get_section_key(caller_frame)
+        reuse = key is not None and not self.section_cache_miss and \
+                self.get_section_cache_path(key).with_suffix(".json").exists()
+        self.section_cache_miss = not reuse
+        super().next_section(name, type, skip_animations=reuse)
+        self.sections_cache_keys[self.renderer.file_writer.sections[-1]] = (key, reuse)
+
+    def get_section_key(self, caller_frame) -> str | None:
+        """
+        The scene fingerprint (all of its code, construct included), the scene state and the call stack from
+        construct down to the next_section call. None (never reused) when construct isn't on the stack.
+        """
+        from tools.movie_maker.fingerprint import scene_fingerprint
+
+        stack_code = self.get_stack_code(caller_frame)
+        if stack_code is None:
+            return None
+        if not hasattr(self, "scene_code_fingerprint"):
+            self.scene_code_fingerprint = scene_fingerprint(type(self), {"presentation_mode": self.PRESENTATION_MODE})
+        state_hash = get_hash_from_play_call(self, self.renderer.camera, [], self.mobjects)
+        digest = hashlib.sha256()
+        for part in (self.scene_code_fingerprint, state_hash, stack_code):
+            digest.update(part.encode())
+        return digest.hexdigest()
+
+    def get_stack_code(self, caller_frame) -> str | None:
+        """The source of every frame from construct down to caller_frame, and the line each frame is at"""
+        parts = []
+        frame = caller_frame
+        while frame is not None:
+            try:
+                source = inspect.getsource(frame.f_code)
+            except OSError:
+                return None
+            parts.append(f"{frame.f_code.co_name}:{frame.f_lineno - frame.f_code.co_firstlineno}\n{source}")
+            if frame.f_code.co_name == "construct" and frame.f_locals.get("self") is self:
+                return "\n".join(reversed(parts))
+            frame = frame.f_back
+        return None
+
+    def get_section_cache_path(self, key: str) -> Path:
+        return Path(config.get_dir("media_dir")) / SECTION_CACHE_DIR_NAME / self.__class__.__name__ / key
+
+    def render(self, preview: bool = False):
+        if self.PROFILE:
+            self.render_profiled(preview)
+        else:
+            super().render(preview)
+        if self.SECTION_CACHE and self.PRESENTATION_MODE and config.save_sections:
+            self.splice_cached_sections()
+            self.prune_section_cache()
+
+    def render_profiled(self, preview: bool = False):
+        self.profiler = SceneProfiler(self)
+        self.profiler.attach()
+        try:
+            super().render(preview)
+        finally:
+            self.profiler.detach()
+        self.profiler.save(Path(config.get_dir("media_dir")) / PROFILES_DIR_NAME)
+
+    def splice_cached_sections(self):
+        """Replace the skipped sections with their cached clips, store the new clips and rewrite the sections index"""
+        file_writer = self.renderer.file_writer
+        sections_dir = file_writer.sections_output_dir
+        index_path = sections_dir / f"{file_writer.output_name}.json"
+        with open(index_path, "r") as f:
+            rendered_dicts = iter(json.load(f))
+
+        clips = []  # (clip path, section dict)
+        for section in file_writer.sections:
+            key, reused = self.sections_cache_keys.get(section, (None, False))
+            if reused:
+                with open(self.get_section_cache_path(key).with_suffix(".json"), "r") as f:
+                    section_dict = json.load(f)
+                if section_dict is not None:
+                    clips.append((self.get_section_cache_path(key).with_suffix(".mp4"), section_dict))
+            elif section.video is not None:
+                section_dict = next(rendered_dicts)
+                clips.append((sections_dir / section.video, section_dict))
+                if key is not None:
+                    self.store_section_clip(key, sections_dir / section.video, section_dict)
+        # sections without animations were dropped by the file writer, remember them as empty
+        for section, (key, reused) in self.sections_cache_keys.items():
+            if not reused and section not in file_writer.sections:
+                self.store_section_clip(key, None, None)
+
+        if not any(reused for _, reused in self.sections_cache_keys.values()):
+            return
+        # move to temporary names first, cached and rendered clips may swap indices
+        tmp_clips = []
+        for i, (clip, section_dict) in enumerate(clips):
+            tmp_clip = sections_dir / f"{file_writer.output_name}_{i:04}.tmp{clip.suffix}"
+            if clip.parent == sections_dir:
+                clip.replace(tmp_clip)
+            else:
+                shutil.copyfile(clip, tmp_clip)
+            tmp_clips.append(tmp_clip)
+        sections_index = []
+        for i, (tmp_clip, (_, section_dict)) in enumerate(zip(tmp_clips, clips)):
+            section_video = f"{file_writer.output_name}_{i:04}{tmp_clip.suffix}"
+            tmp_clip.replace(sections_dir / section_video)
+            sections_index.append({**section_dict, "video": section_video})
+        with open(index_path, "w") as f:
+            json.dump(sections_index, f, indent=4)
+        file_writer.combine_files([str(sections_dir / d["video"]) for d in sections_index],
+                                  file_writer.movie_file_path)
+
+    def prune_section_cache(self):
+        """Delete the cached clips of keys this render didn't use, so the cache dir of the scene doesn't keep growing"""
+        used_keys = {key for key, _ in self.sections_cache_keys.values() if key is not None}
+        cache_dir = self.get_section_cache_path("").parent
+        if not cache_dir.exists():
+            return
+        for file in cache_dir.iterdir():
+            if file.stem not in used_keys:
+                file.unlink()
+
+    def store_section_clip(self, key: str, clip: Path | None, section_dict: dict | None):
+        cache_path = self.get_section_cache_path(key)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        if clip is not None:
+            shutil.copyfile(clip, cache_path.with_suffix(".mp4"))
+        with open(cache_path.with_suffix(".json"), "w") as f:
+            json.dump(section_dict, f, indent=4)
+